@@ -0,0 +1,75 @@
+import random
+from itertools import combinations
+from typing import List, Optional, Sequence
+
+from seeding import resolve_rng
+
+# Diversity is estimated from a few sampled genome pairs instead of all O(n^2) pairs
+SAMPLE_PAIRS = 10
+
+# Control targets: keep the normalized Hamming diversity inside this band
+LOW_DIVERSITY = 0.05
+HIGH_DIVERSITY = 0.25
+# Generations without improvement before the best fitness counts as stalled
+STALL_GENERATIONS = 5
+
+
+def hamming_distance(genome1: Sequence, genome2: Sequence) -> float:
+    # Fraction of grid positions whose genes differ
+    length = min(len(genome1), len(genome2))
+    if length == 0:
+        return 0.0
+    differences = sum(1 for i in range(length) if genome1[i] != genome2[i])
+    return (differences + abs(len(genome1) - len(genome2))) / max(len(genome1), len(genome2))
+
+
+def population_diversity(population: List[Sequence], samples: int = SAMPLE_PAIRS,
+                         rng: Optional[random.Random] = None) -> float:
+    rng = resolve_rng(rng)
+    if len(population) < 2:
+        return 0.0
+    n = len(population)
+    if n * (n - 1) // 2 <= samples:
+        pairs = list(combinations(range(n), 2))
+    else:
+        # Distinct index pairs drawn directly, without listing all O(n^2) of them
+        drawn = set()
+        while len(drawn) < samples:
+            drawn.add(tuple(sorted(rng.sample(range(n), 2))))
+        pairs = sorted(drawn)
+    return sum(hamming_distance(population[i], population[j]) for i, j in pairs) / len(pairs)
+
+
+class AdaptiveControl:
+    # Raises mutation strength and lowers crossover probability when the
+    # population collapses or stalls, and relaxes back towards the base rates
+    # while diversity is healthy and the best fitness keeps improving.
+
+    def __init__(self, mutation_rate: float = 1.0, mutation_strength: int = 1,
+                 crossover_rate: float = 1.0, max_mutation_strength: int = 3,
+                 min_crossover_rate: float = 0.5, step: float = 1.5):
+        self.base_mutation_rate = mutation_rate
+        self.base_mutation_strength = mutation_strength
+        self.base_crossover_rate = crossover_rate
+        self.max_mutation_strength = max_mutation_strength
+        self.min_crossover_rate = min_crossover_rate
+        self.step = step
+
+        self.mutation_rate = mutation_rate
+        self.mutation_strength = mutation_strength
+        self.crossover_rate = crossover_rate
+
+    def update(self, diversity: float, stale_generations: int):
+        if diversity < LOW_DIVERSITY or stale_generations >= STALL_GENERATIONS:
+            # Clones dominate: recombining them is wasted work, perturb harder instead
+            self.mutation_rate = 1.0
+            self.mutation_strength = min(self.max_mutation_strength,
+                                         max(self.mutation_strength + 1, int(self.mutation_strength * self.step)))
+            self.crossover_rate = max(self.min_crossover_rate, self.crossover_rate / self.step)
+        elif diversity > HIGH_DIVERSITY:
+            self.mutation_rate = self.base_mutation_rate
+            self.mutation_strength = self.base_mutation_strength
+            self.crossover_rate = self.base_crossover_rate
+        else:
+            self.mutation_strength = max(self.base_mutation_strength, int(self.mutation_strength / self.step))
+            self.crossover_rate = min(self.base_crossover_rate, self.crossover_rate * self.step)
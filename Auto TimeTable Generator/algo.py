@@ -1,7 +1,6 @@
 import random
 from typing import List, Tuple
 import streamlit as st
-from ortools.sat.python import cp_model
 
 # Constants
 DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
@@ -45,6 +44,9 @@ MUTATION_RATE = 0.01
 Genome = List[Tuple[str, str, str, str, str, str]]
 
 def create_initial_solution() -> Genome:
+    # OR-Tools is only needed for the initial solution, so it is imported on first use
+    from ortools.sat.python import cp_model
+
     model = cp_model.CpModel()
     
     # Variables
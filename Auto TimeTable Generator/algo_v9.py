@@ -1,250 +1,34 @@
-import random
-from typing import List, Tuple
-import pandas as pd
-import streamlit as st
+import engine
+from engine import Genome
 
-# Load CSV data
-rooms_df = pd.read_csv('Data/rooms.csv')
-subjects_df = pd.read_csv('Data/subjects.csv')
-sections_df = pd.read_csv('Data/sections.csv')
+# Streamlit front end for the GA in engine.py. Importing this module stays as light as the
+# engine: Streamlit and the pandas-based formatting are only loaded when a timetable is rendered.
+# Engine names (genetic_algorithm, ROOMS, ...) are readable here for older callers; parameters
+# such as GENERATIONS must be set on engine itself.
 
-# Constants
-DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-TIMES = ["9:00-9:50", "10:00-10:50", "11:00-11:50",
-         "12:00-12:50", "1:40-2:30", "2:40-3:30", "3:40-4:30"]
 
-# Convert DataFrames to dictionaries
-ROOMS = dict(zip(sections_df['Section'], sections_df['Room']))
-SUBJECTS = subjects_df['Subject'].unique().tolist()
+def __getattr__(name: str):
+    return getattr(engine, name)
 
-# Create SUBJECT_HOURS and TEACHERS dictionaries
-SUBJECT_HOURS = {}
-TEACHERS = {}
-for _, row in subjects_df.iterrows():
-    SUBJECT_HOURS[row['Subject']] = row['Hours']
-    TEACHERS[row['Subject']] = row['Teachers'].split(',')
 
-LAB_ROOMS = rooms_df[rooms_df['Type'] == 'Lab']['Room'].tolist()
+def display_timetable(genome: Genome, key: str = "timetable"):
+    # Paginated and searchable; the frames are built once per genome, not on every rerun
+    from views import render_timetables
 
-# Parameters
-POPULATION_SIZE = 10
-GENERATIONS = 100
-MUTATION_RATE = 0.01
-
-# Genome representation: List of tuples (day, time, section, subject, teacher, room)
-Gene = Tuple[str, str, str, str, str, str]
-Genome = List[Gene]
-
-# Fixed slots for second languages
-SECOND_LANGUAGE_SLOTS = {
-    "Tuesday": "11:00-11:50",
-    "Wednesday": "9:00-9:50",
-    "Thursday": "10:00-10:50"
-}
-
-# Fixed slots for English
-ENGLISH_SLOTS = {
-    "Monday": "10:00-10:50",
-    "Wednesday": "10:00-10:50",
-    "Thursday": "11:00-11:50"
-}
-
-def generate_genome() -> Genome:
-    genome = []
-    subject_hours_remaining = {
-        section: SUBJECT_HOURS.copy() for section in ROOMS.keys()}
-    teacher_assignment = {section: {} for section in ROOMS.keys()}
-
-    for section in ROOMS.keys():
-        labs_scheduled = set()
-        for day in DAYS:
-            day_subjects = set()
-            for time in TIMES:
-                # Handle fixed second language slots
-                if day in SECOND_LANGUAGE_SLOTS and time == SECOND_LANGUAGE_SLOTS[day]:
-                    genome.append((day, time, section, "Second Language", "N/A", ROOMS[section]))
-                    continue
-
-                # Handle fixed English slots
-                if day in ENGLISH_SLOTS and time == ENGLISH_SLOTS[day]:
-                    genome.append((day, time, section, "English", "N/A", ROOMS[section]))
-                    continue
-
-                if not any(subject_hours_remaining[section].values()):
-                    genome.append(
-                        (day, time, section, "Free", "N/A", ROOMS[section]))
-                    continue
-
-                available_subjects = [subject for subject, hours in subject_hours_remaining[section].items(
-                ) if hours > 0 and subject not in day_subjects]
-
-                if not available_subjects:
-                    genome.append(
-                        (day, time, section, "Free", "N/A", ROOMS[section]))
-                    continue
-
-                subject = random.choice(available_subjects)
-
-                if subject in teacher_assignment[section]:
-                    teacher = teacher_assignment[section][subject]
-                else:
-                    if subject.endswith("Lab"):
-                        base_subject = subject.replace(" Lab", "")
-                        if base_subject in teacher_assignment[section]:
-                            teacher = teacher_assignment[section][base_subject]
-                        else:
-                            teacher = random.choice(TEACHERS[subject])
-                            teacher_assignment[section][subject] = teacher
-                            teacher_assignment[section][base_subject] = teacher
-                    else:
-                        # Ensure teacher isn't already teaching another subject for this section
-                        potential_teachers = [t for t in TEACHERS[subject] if t not in teacher_assignment[section].values()]
-                        if not potential_teachers:
-                            teacher = random.choice(TEACHERS[subject])  # Fall back to any teacher if all are used
-                        else:
-                            teacher = random.choice(potential_teachers)
-                        teacher_assignment[section][subject] = teacher
-
-                if subject.endswith("Lab"):
-                    if subject not in labs_scheduled and subject_hours_remaining[section][subject] >= 2 and time != TIMES[-1]:
-                        time_index = TIMES.index(time)
-                        next_time = TIMES[time_index + 1]
-                        lab_room = random.choice(LAB_ROOMS)
-                        genome.append(
-                            (day, time, section, subject, teacher, lab_room))
-                        genome.append(
-                            (day, next_time, section, subject, teacher, lab_room))
-                        subject_hours_remaining[section][subject] -= 2
-                        labs_scheduled.add(subject)
-                        break  # Skip next time slot
-                    else:
-                        genome.append(
-                            (day, time, section, "Free", "N/A", ROOMS[section]))
-                else:
-                    genome.append(
-                        (day, time, section, subject, teacher, ROOMS[section]))
-                    subject_hours_remaining[section][subject] -= 1
-                    day_subjects.add(subject)
-
-        # Fill any remaining slots with "Free"
-        total_slots = len(DAYS) * len(TIMES)
-        if len([gene for gene in genome if gene[2] == section]) < total_slots:
-            for day in DAYS:
-                for time in TIMES:
-                    if not any(gene for gene in genome if gene[2] == section and gene[0] == day and gene[1] == time):
-                        genome.append(
-                            (day, time, section, "Free", "N/A", ROOMS[section]))
-    return genome
-
-
-def calculate_fitness(genome: Genome) -> int:
-    fitness = 0
-
-    for section in ROOMS.keys():
-        section_timetable = [entry for entry in genome if entry[2] == section]
-
-        # Constraint: No subject repeats more than once per day (except labs)
-        for day in DAYS:
-            daily_schedule = [
-                entry for entry in section_timetable if entry[0] == day]
-            subjects_today = [entry[3] for entry in daily_schedule if not entry[3].endswith("Lab") and entry[3] != "Free"]
-            if len(subjects_today) != len(set(subjects_today)):
-                fitness -= 10
-
-        # Constraint: Labs should be scheduled consecutively
-        for day in DAYS:
-            daily_schedule = sorted(
-                [entry for entry in section_timetable if entry[0] == day], key=lambda x: TIMES.index(x[1]))
-            for i in range(len(daily_schedule) - 1):
-                current = daily_schedule[i]
-                next_slot = daily_schedule[i + 1]
-                if current[3].endswith("Lab"):
-                    if not (next_slot[3] == current[3] and next_slot[5] == current[5]):
-                        fitness -= 5
-
-        # Constraint: Correct room assignments
-        for entry in section_timetable:
-            subject, room = entry[3], entry[5]
-            if subject.endswith("Lab") and room not in LAB_ROOMS:
-                fitness -= 5
-            elif not subject.endswith("Lab") and room != ROOMS[section]:
-                fitness -= 5
-
-        # Constraint: No full day free
-        for day in DAYS:
-            daily_schedule = [
-                entry for entry in section_timetable if entry[0] == day]
-            if all(entry[3] == "Free" for entry in daily_schedule):
-                fitness -= 10
-
-    return fitness
-
-
-def select_parents(population: List[Genome]) -> Tuple[Genome, Genome]:
-    fitness_scores = sorted(population, key=calculate_fitness, reverse=True)
-    return fitness_scores[0], fitness_scores[1]
-
-
-def crossover(parent1: Genome, parent2: Genome) -> Tuple[Genome, Genome]:
-    point = random.randint(1, len(parent1) - 2)
-    child1 = parent1[:point] + parent2[point:]
-    child2 = parent2[:point] + parent1[point:]
-    return child1, child2
-
-
-def mutate(genome: Genome) -> Genome:
-    mutated_genome = genome.copy()
-    index = random.randint(0, len(genome) - 1)
-    day, time, section, _, _, _ = mutated_genome[index]
-
-    available_subjects = SUBJECTS + ["Free"]
-    subject = random.choice(available_subjects)
-
-    if subject == "Free":
-        teacher = "N/A"
-        room = ROOMS[section]
-    elif subject.endswith("Lab"):
-        teacher = random.choice(TEACHERS[subject])
-        room = random.choice(LAB_ROOMS)
-    else:
-        # Ensure the mutated subject's teacher is not already teaching another subject in the same section
-        potential_teachers = [t for t in TEACHERS[subject] if t not in [gene[4] for gene in genome if gene[2] == section]]
-        teacher = random.choice(potential_teachers) if potential_teachers else random.choice(TEACHERS[subject])
-        room = ROOMS[section]
-
-    mutated_genome[index] = (day, time, section, subject, teacher, room)
-    return mutated_genome
-
-
-def genetic_algorithm() -> Genome:
-    population = [generate_genome() for _ in range(POPULATION_SIZE)]
-
-    for _ in range(GENERATIONS):
-        parent1, parent2 = select_parents(population)
-        child1, child2 = crossover(parent1, parent2)
-        population += [mutate(child1), mutate(child2)]
-        population = sorted(population, key=calculate_fitness, reverse=True)[:POPULATION_SIZE]
-
-    return max(population, key=calculate_fitness)
-
-
-def display_timetable(genome: Genome):
-    timetable = {section: {day: {} for day in DAYS} for section in ROOMS.keys()}
-
-    for entry in genome:
-        day, time, section, subject, teacher, room = entry
-        timetable[section][day][time] = f"{subject}\n{teacher}\n{room}"
-
-    for section in ROOMS.keys():
-        st.subheader(f"Section {section}")
-        df = pd.DataFrame.from_dict(timetable[section], orient="index")
-        st.dataframe(df)
+    render_timetables(genome, engine.DAYS, engine.TIMES, key)
 
 
 def main():
+    import streamlit as st
+
     st.title("Automatic Timetable Generator")
-    st.write("Generating the optimal timetable using Genetic Algorithm...")
-    best_genome = genetic_algorithm()
+    # One GA run per session; searching and paging only rerender
+    if "result" not in st.session_state or st.button("Generate again"):
+        with st.spinner("Generating the optimal timetable using Genetic Algorithm..."):
+            best_genome, stop_reason = engine.genetic_algorithm()
+        st.session_state["result"] = (best_genome, stop_reason, engine.calculate_fitness(best_genome))
+    best_genome, stop_reason, fitness = st.session_state["result"]
+    st.write(f"Stopped: {stop_reason} (fitness {fitness})")
     display_timetable(best_genome)
 
 
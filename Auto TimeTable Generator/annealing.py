@@ -0,0 +1,91 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import engine
+from engine import Genome
+from memetic import DeltaEvaluator, random_move
+from seeding import make_rng, resolve_rng, spawn_seeds
+
+# Parameters
+CHAINS = os.cpu_count() or 1
+MAX_STEPS = 20000
+TIME_LIMIT = 10.0           # seconds per chain
+START_TEMPERATURE = 10.0    # a -10 move is accepted with p = 1/e at the start
+END_TEMPERATURE = 0.05
+
+# Cooling schedules map run progress in [0, 1] to a temperature
+Schedule = Callable[[float, float, float], float]
+SCHEDULES: Dict[str, Schedule] = {
+    "geometric": lambda start, end, progress: start * (end / start) ** progress,
+    "linear": lambda start, end, progress: start + (end - start) * progress,
+    "logarithmic": lambda start, end, progress: start / (1 + (start / end - 1) * math.log1p(progress * (math.e - 1))),
+}
+
+
+def simulated_annealing(genome: Optional[Genome] = None, schedule: str = "geometric",
+                        max_steps: int = MAX_STEPS, time_limit: Optional[float] = TIME_LIMIT,
+                        start_temperature: float = START_TEMPERATURE,
+                        end_temperature: float = END_TEMPERATURE,
+                        rng: Optional[random.Random] = None) -> Tuple[Genome, int]:
+    rng = resolve_rng(rng)
+    cooling = SCHEDULES[schedule]
+    evaluator = DeltaEvaluator(genome if genome is not None else engine.generate_genome(rng))
+    best_genome, best_fitness = list(evaluator.genome), evaluator.fitness
+    start = time.time()
+
+    for step in range(max_steps):
+        if best_fitness >= 0:
+            break
+        elapsed = time.time() - start
+        if time_limit is not None and elapsed >= time_limit:
+            break
+        # Progress follows whichever budget runs out first
+        progress = step / max_steps
+        if time_limit is not None:
+            progress = max(progress, elapsed / time_limit)
+        temperature = cooling(start_temperature, end_temperature, progress)
+
+        move = random_move(evaluator, rng)
+        if not move:
+            continue
+        delta = evaluator.swap_delta(move)
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            evaluator.apply(move)
+            if evaluator.fitness > best_fitness:
+                best_genome, best_fitness = list(evaluator.genome), evaluator.fitness
+
+    return best_genome, best_fitness
+
+
+def run_chain(data_dir: str, seed: int, schedule: str, max_steps: int, time_limit: Optional[float],
+              genome: Optional[Genome] = None) -> Tuple[Genome, int]:
+    # Runs in a worker process: spawned workers start without the caller's engine globals,
+    # so every chain loads its dataset itself
+    engine.load_data(data_dir)
+    return simulated_annealing(genome, schedule=schedule, max_steps=max_steps, time_limit=time_limit,
+                               rng=make_rng(seed))
+
+
+def parallel_annealing(chains: int = CHAINS, seed: int = 0, schedule: str = "geometric",
+                       max_steps: int = MAX_STEPS, time_limit: Optional[float] = TIME_LIMIT,
+                       data_dir: str = engine.DATA_DIR, genome: Optional[Genome] = None) -> Genome:
+    # Independent chains in separate processes, each on its own spawned stream and all starting
+    # from the given genome (a random one per chain without it); the best genome goes straight
+    # to display_timetable
+    with ProcessPoolExecutor(max_workers=chains) as executor:
+        futures = [executor.submit(run_chain, data_dir, chain_seed, schedule, max_steps, time_limit, genome)
+                   for chain_seed in spawn_seeds(seed, chains)]
+        results = [future.result() for future in futures]
+    best_genome, _ = max(results, key=lambda x: x[1])
+    return best_genome
+
+
+if __name__ == "__main__":
+    start = time.time()
+    best = parallel_annealing()
+    print(f"Time taken: {time.time() - start:.2f}s")
+    print(f"Best fitness: {engine.calculate_fitness(best)}")
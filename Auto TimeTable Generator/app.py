@@ -217,11 +217,21 @@ def format_timetable(genome: Genome, section: str) -> str:
     
     return timetable
 
-# Streamlit UI
-st.title("College Timetable Generator")
+def main():
+    # Streamlit UI
+    st.title("College Timetable Generator")
 
-section = st.selectbox("Select Section", SECTIONS)
-if st.button("Generate Timetable"):
-    genome = genetic_algorithm()
-    timetable = format_timetable(genome, section)
-    st.text(timetable)
\ No newline at end of file
+    section = st.selectbox("Select Section", SECTIONS)
+    # The GA only runs on the button; switching sections reuses the stored result
+    if st.button("Generate Timetable"):
+        st.session_state["genome"] = genetic_algorithm()
+        st.session_state["formatted"] = {}
+    if "genome" in st.session_state:
+        formatted = st.session_state["formatted"]
+        if section not in formatted:
+            formatted[section] = format_timetable(st.session_state["genome"], section)
+        st.text(formatted[section])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import engine
+from engine import Genome
+from seeding import make_rng, numpy_rng
+from telemetry import GenerationCallback, GenerationStats, summarize_scores
+
+# Parameters
+POPULATION_SIZE = 64
+ELITES = 2
+GENE_MUTATION_RATE = 0.01  # chance that any one gene is reset
+
+# Columns of the integer genome tensor; day, time and section are implied by the position
+SUBJECT, TEACHER, ROOM = 0, 1, 2
+NO_TEACHER = -1  # "N/A"
+
+
+class GenomeCodec:
+    # Integer encoding of canonical genomes: a (population, sections * days * times, 3) tensor
+    # holding subject, teacher and room indices, position = (section, day, time) in grid order
+
+    def __init__(self):
+        model = engine.MODEL
+        self.model = model
+        self.sections = list(engine.ROOMS.keys())
+        self.grid = engine.GRID
+        self.days, self.times = self.grid.days, self.grid.times
+        self.shape = (len(self.sections), len(self.days), len(self.times))
+        self.length = int(np.prod(self.shape))
+
+        # Subject indices follow the model, "Free" is appended after the fixed-slot subjects
+        self.subjects = model.subjects + ["Free"]
+        self.free = len(model.subjects)
+        # Pinned genes may use rooms outside rooms.csv (a hall, say)
+        pinned_rooms = {room for slots in model.pins.values() for _, _, room in slots.values()}
+        self.rooms = sorted(set(engine.ROOMS.values()) | set(engine.LAB_ROOMS) | pinned_rooms)
+        self.room_index = {room: i for i, room in enumerate(self.rooms)}
+
+        self.is_lab = np.array([subject.endswith("Lab") for subject in self.subjects])
+        self.is_lab_room = np.isin(np.arange(len(self.rooms)), [self.room_index[room] for room in engine.LAB_ROOMS])
+        self.lab_rooms = np.array([self.room_index[room] for room in engine.LAB_ROOMS], dtype=np.int32)
+        self.section_room = np.array([self.room_index[engine.ROOMS[s]] for s in self.sections], dtype=np.int32)
+        # Home room of every position, for lectures and free periods
+        self.home_room = np.repeat(self.section_room, len(self.days) * len(self.times))
+
+        # Mutation draws from the dataset subjects plus Free, never from the fixed-slot subjects
+        self.mutable_subjects = np.array([model.subject_index[s] for s in engine.SUBJECTS] + [self.free],
+                                         dtype=np.int32)
+        # Pinned genes (fixed slots included) are masked out of mutation
+        self.fixed_positions = model.locked.ravel()
+
+        # Eligible teachers per subject, padded to a rectangle so a draw is one fancy index
+        counts = [len(candidates) for candidates in model.candidates] + [0]
+        self.teacher_counts = np.array(counts, dtype=np.int32)
+        self.teacher_table = np.full((len(self.subjects), max(max(counts), 1)), NO_TEACHER, dtype=np.int32)
+        for s, candidates in enumerate(model.candidates):
+            self.teacher_table[s, :len(candidates)] = [model.teacher_index[t] for t in candidates]
+
+    def empty(self, population_size: int) -> np.ndarray:
+        return np.empty((population_size, self.length, 3), dtype=np.int32)
+
+    def encode(self, genome: Genome, out: np.ndarray):
+        # Missing slots become Free; a slot written twice keeps its last gene, like the display grid
+        out[:, SUBJECT] = self.free
+        out[:, TEACHER] = NO_TEACHER
+        out[:, ROOM] = self.home_room
+        day_index, period = self.grid.day_index, self.grid.period
+        for day, time_, section, subject, teacher, room in genome:
+            position = self.model.section_index[section] * self.grid.slots + day_index[day] * len(self.times) + period[time_]
+            out[position] = (self.model.subject_index.get(subject, self.free),
+                             self.model.teacher_index.get(teacher, NO_TEACHER), self.room_index[room])
+
+    def decode(self, encoded: np.ndarray) -> Genome:
+        genome = []
+        for position, (subject, teacher, room) in enumerate(encoded.tolist()):
+            section, rest = divmod(position, len(self.days) * len(self.times))
+            day, time_ = divmod(rest, len(self.times))
+            genome.append((self.days[day], self.times[time_], self.sections[section], self.subjects[subject],
+                           self.model.teachers[teacher] if teacher != NO_TEACHER else "N/A", self.rooms[room]))
+        return genome
+
+
+def encode_population(codec: GenomeCodec, genomes: List[Genome]) -> np.ndarray:
+    population = codec.empty(len(genomes))
+    for i, genome in enumerate(genomes):
+        codec.encode(genome, population[i])
+    return population
+
+
+def batch_fitness(codec: GenomeCodec, population: np.ndarray) -> np.ndarray:
+    # calculate_fitness for every genome at once on the (population, section, day, time) grid
+    grid = population.reshape((len(population),) + codec.shape + (3,))
+    subjects, rooms = grid[..., SUBJECT], grid[..., ROOM]
+    is_lab = codec.is_lab[subjects]
+    is_free = subjects == codec.free
+
+    # Constraint: No subject repeats more than once per day (except labs); labs and free
+    # periods get distinct negative stand-ins so they never compare equal
+    lectures = np.where(is_lab | is_free, -1 - np.arange(len(codec.times)), subjects)
+    lectures.sort(axis=-1)
+    repeats = (lectures[..., 1:] == lectures[..., :-1]).any(axis=-1)
+
+    # Constraint: Labs should be scheduled consecutively; pinned genes are exempt from this and
+    # the room check, as in calculate_fitness
+    movable = ~codec.fixed_positions.reshape(codec.shape)
+    paired = (subjects[..., 1:] == subjects[..., :-1]) & (rooms[..., 1:] == rooms[..., :-1])
+    broken_labs = (is_lab[..., :-1] & ~paired & movable[..., :-1]).sum(axis=(-1, -2, -3))
+
+    # Constraint: Correct room assignments
+    home = codec.section_room[:, None, None]
+    wrong_rooms = (np.where(is_lab, ~codec.is_lab_room[rooms], rooms != home) & movable).sum(axis=(-1, -2, -3))
+
+    # Constraint: No full day free
+    free_days = is_free.all(axis=-1)
+
+    return -(10 * repeats.sum(axis=(-1, -2)) + 5 * broken_labs + 5 * wrong_rooms + 10 * free_days.sum(axis=(-1, -2)))
+
+
+def batch_crossover(codec: GenomeCodec, parents1: np.ndarray, parents2: np.ndarray, out: np.ndarray,
+                    rng: np.random.Generator, block: bool = True):
+    # Mask crossover into a preallocated buffer: children start as parents1 and take parents2's
+    # gene wherever the mask is set. Block masks swap whole section-days, keeping lab pairs intact.
+    np.copyto(out, parents1)
+    if block:
+        mask = rng.random((len(out), codec.shape[0], codec.shape[1], 1, 1)) < 0.5
+        view = out.reshape((len(out),) + codec.shape + (3,))
+        np.copyto(view, parents2.reshape(view.shape), where=mask)
+    else:
+        mask = rng.random((len(out), codec.length, 1)) < 0.5
+        np.copyto(out, parents2, where=mask)
+
+
+def batch_mutate(codec: GenomeCodec, population: np.ndarray, rng: np.random.Generator,
+                 rate: float = GENE_MUTATION_RATE):
+    # Masked random resets in place: each selected gene gets a random subject with an eligible
+    # teacher and a matching room; pinned genes are never touched
+    mask = (rng.random(population.shape[:2]) < rate) & ~codec.fixed_positions
+    rows, positions = np.nonzero(mask)
+    if not len(rows):
+        return
+    subjects = codec.mutable_subjects[rng.integers(len(codec.mutable_subjects), size=len(rows))]
+    counts = codec.teacher_counts[subjects]
+    picks = (rng.random(len(rows)) * np.maximum(counts, 1)).astype(np.int32)
+    teachers = np.where(counts > 0, codec.teacher_table[subjects, picks], NO_TEACHER)
+    lab_rooms = codec.lab_rooms[rng.integers(len(codec.lab_rooms), size=len(rows))]
+    rooms = np.where(codec.is_lab[subjects], lab_rooms, codec.home_room[positions])
+    population[rows, positions, SUBJECT] = subjects
+    population[rows, positions, TEACHER] = teachers
+    population[rows, positions, ROOM] = rooms
+
+
+def tournament(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    # Binary tournaments for a whole generation of parents in one draw
+    a, b = rng.integers(len(fitness), size=(2, count))
+    return np.where(fitness[a] >= fitness[b], a, b)
+
+
+def batch_genetic_algorithm(population_size: int = POPULATION_SIZE,
+                            target_fitness: Optional[int] = engine.UNSET,
+                            patience: Optional[int] = engine.UNSET,
+                            time_limit: Optional[float] = engine.UNSET,
+                            max_evaluations: Optional[int] = engine.UNSET,
+                            on_generation: Optional[GenerationCallback] = None,
+                            block: bool = True,
+                            seed: Optional[int] = None,
+                            initial: Optional[Sequence[Genome]] = None,
+                            workers: int = 1,
+                            generations: Optional[int] = None) -> Tuple[Genome, str]:
+    # Generational GA on the integer tensor: tournament selection, mask crossover and masked resets
+    # for the whole population per step, with every buffer allocated once and swapped each generation.
+    # With several workers both generation buffers live in shared memory and are scored in place.
+    # Stop parameters and generations left out take engine's module parameters, as genetic_algorithm does.
+    target_fitness = engine.TARGET_FITNESS if target_fitness is engine.UNSET else target_fitness
+    patience = engine.PATIENCE if patience is engine.UNSET else patience
+    time_limit = engine.TIME_LIMIT if time_limit is engine.UNSET else time_limit
+    max_evaluations = engine.MAX_EVALUATIONS if max_evaluations is engine.UNSET else max_evaluations
+    generations = engine.GENERATIONS if generations is None else generations
+    if max_evaluations is not None:
+        population_size = max(1, min(population_size, max_evaluations))
+    codec = GenomeCodec()
+    generator = numpy_rng(seed)
+    rng = make_rng(seed)
+    start = time.time()
+
+    store = evaluator = None
+    if workers > 1:
+        from shared_population import ParallelEvaluator, SharedPopulation
+        store = SharedPopulation.create(codec, population_size)
+        evaluator = ParallelEvaluator(codec, store, workers)
+        buffers = store.genomes
+    else:
+        buffers = np.empty((2, population_size, codec.length, 3), dtype=np.int32)
+    mates = codec.empty(population_size)
+
+    def evaluate(buffer: int) -> np.ndarray:
+        if evaluator is None:
+            return batch_fitness(codec, buffers[buffer])
+        evaluator.evaluate(buffer)
+        return store.fitness[buffer]
+
+    try:
+        initial = list(initial or [])[:population_size]
+        initial += [engine.construct_genome(rng=rng) for _ in range(population_size - len(initial))]
+        current = 0
+        for i, genome in enumerate(initial):
+            codec.encode(genome, buffers[current, i])
+        population, offspring = buffers[current], buffers[1 - current]
+        fitness = evaluate(current)
+        evaluations = population_size
+
+        best_fitness = int(fitness.max())
+        stale_generations = 0
+        stop_reason = "generations"
+
+        for generation in range(generations):
+            if target_fitness is not None and best_fitness >= target_fitness:
+                stop_reason = "target_fitness"
+                break
+            if patience is not None and stale_generations >= patience:
+                stop_reason = "patience"
+                break
+            if time_limit is not None and time.time() - start >= time_limit:
+                stop_reason = "time_limit"
+                break
+            if max_evaluations is not None and evaluations + population_size > max_evaluations:
+                stop_reason = "max_evaluations"
+                break
+
+            t0 = time.perf_counter()
+            np.take(population, tournament(fitness, population_size, generator), axis=0, out=offspring)
+            np.take(population, tournament(fitness, population_size, generator), axis=0, out=mates)
+            t1 = time.perf_counter()
+            batch_crossover(codec, offspring, mates, offspring, generator, block=block)
+            t2 = time.perf_counter()
+            batch_mutate(codec, offspring, generator)
+            # Elitism: the best genomes of this generation survive unchanged
+            elites = np.argsort(fitness)[::-1][:ELITES]
+            offspring[:len(elites)] = population[elites]
+            t3 = time.perf_counter()
+            fitness = evaluate(1 - current)
+            evaluations += population_size
+            t4 = time.perf_counter()
+
+            current = 1 - current
+            population, offspring = offspring, population
+
+            if fitness.max() > best_fitness:
+                best_fitness = int(fitness.max())
+                stale_generations = 0
+            else:
+                stale_generations += 1
+
+            if on_generation is not None:
+                # Diversity: fraction of genes that differ from the leading elite
+                on_generation(GenerationStats(
+                    generation=generation,
+                    diversity=float((population[0] != population[1:]).any(axis=-1).mean()) if population_size > 1 else 0.0,
+                    evaluations=evaluations,
+                    selection_time=t1 - t0,
+                    crossover_time=t2 - t1,
+                    mutation_time=t3 - t2,
+                    fitness_time=t4 - t3,
+                    **summarize_scores(fitness.tolist())))
+
+        return codec.decode(population[int(np.argmax(fitness))]), stop_reason
+    finally:
+        if evaluator is not None:
+            evaluator.shutdown()
+            # Views into the shared blocks have to be released before the blocks can be closed
+            buffers = population = offspring = fitness = None
+            store.close()
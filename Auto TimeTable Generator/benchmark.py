@@ -0,0 +1,215 @@
+import argparse
+import csv
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from feasibility import analyze
+from slots import default_grid
+
+# Synthetic instances mirror the layout of Data/*.csv: every section gets the
+# same subject catalogue, each theory subject may have a matching "<name> Lab".
+SECTION_SIZES = [6, 25, 50, 100, 200]
+# Teachers per section; a fixed count cannot cover every size (200 sections need 2600 teaching hours,
+# 60 teachers give at most 60 x 29 open slots)
+TEACHER_RATIOS = [1.0, 3.0]
+SUBJECTS_PER_SECTION = 3
+LABS_PER_SECTION = 2
+TEACHERS_PER_SUBJECT = 6  # smallest pool; larger instances get pools sized to the subject's hours
+POOL_SLACK = 2.0          # pool capacity over the subject's teaching hours, as pools overlap at random
+LECTURE_HOURS = 3
+LAB_HOURS = 2
+SAMPLES = 20
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def section_name(index: int) -> str:
+    # A..Z, then AA, AB, ... like spreadsheet columns
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord("A") + remainder) + name
+    return name
+
+
+def generate_instance(data_dir: str, sections: int, teacher_pool: int, seed: int,
+                      subjects_per_section: int = SUBJECTS_PER_SECTION,
+                      labs_per_section: int = LABS_PER_SECTION,
+                      teachers_per_subject: int = TEACHERS_PER_SUBJECT) -> str:
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+
+    teachers = [f"Teacher {i + 1}" for i in range(teacher_pool)]
+    subjects = [f"Subject {i + 1}" for i in range(subjects_per_section)]
+    # A subject and its lab share a teacher, so a pool has to cover both across all sections
+    grid = default_grid()
+    open_slots = grid.slots - len(grid.fixed)
+    pools = {}
+    for i, subject in enumerate(subjects):
+        hours = (LECTURE_HOURS + (LAB_HOURS if i < labs_per_section else 0)) * sections
+        size = max(teachers_per_subject, math.ceil(POOL_SLACK * hours / open_slots))
+        pools[subject] = rng.sample(teachers, min(size, teacher_pool))
+    section_names = [section_name(i) for i in range(sections)]
+    # Two lab rooms per three sections, as in the sample data (4 lab rooms for 6 sections)
+    lab_rooms = [f"L{i + 1}" for i in range(max(1, sections * 2 // 3))]
+
+    with open(os.path.join(data_dir, "rooms.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Room", "Type"])
+        for section in section_names:
+            writer.writerow([f"R{section}", "Lecture"])
+        for room in lab_rooms:
+            writer.writerow([room, "Lab"])
+
+    with open(os.path.join(data_dir, "sections.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Section", "Room"])
+        for section in section_names:
+            writer.writerow([section, f"R{section}"])
+
+    with open(os.path.join(data_dir, "subjects.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Section", "Subject", "Hours", "Teachers"])
+        for section in section_names:
+            for i, subject in enumerate(subjects):
+                writer.writerow([section, subject, LECTURE_HOURS, ",".join(pools[subject])])
+                if i < labs_per_section:
+                    writer.writerow([section, f"{subject} Lab", LAB_HOURS, ",".join(pools[subject])])
+
+    return data_dir
+
+
+def measure(module_name: str, seed: int, samples: int, generations: Optional[int],
+            population_size: Optional[int]) -> Dict:
+    # Runs inside the instance directory: older timetable scripts read Data/*.csv on import
+    sys.path.insert(0, SCRIPT_DIR)
+    module = importlib.import_module(module_name)
+    if hasattr(module, "load_data"):
+        module.load_data("Data")
+    # algo_v9 only forwards reads to engine, so parameters go on the module that owns the GA
+    owner = getattr(module, "engine", module)
+    if generations is not None:
+        owner.GENERATIONS = generations
+    if population_size is not None:
+        owner.POPULATION_SIZE = population_size
+
+    random.seed(seed)
+    start = time.perf_counter()
+    genomes = [module.generate_genome() for _ in range(samples)]
+    generate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for genome in genomes:
+        module.calculate_fitness(genome)
+    fitness_time = time.perf_counter() - start
+
+    random.seed(seed)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = module.genetic_algorithm()
+    ga_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # engine (algo_v9 onwards) also returns the stop reason, older versions only the genome
+    best, stop_reason = result if isinstance(result, tuple) else (result, None)
+    best_fitness = module.calculate_fitness(best)
+
+    return {
+        "genome_length": len(genomes[0]),
+        "generate_per_s": samples / generate_time,
+        "evals_per_s": samples / fitness_time,
+        "ga_seconds": ga_time,
+        "ga_peak_bytes": peak,
+        "best_fitness": best_fitness,
+        "stop_reason": stop_reason,
+        # Without early stopping a feasible result is only known at the end of the run
+        "time_to_feasible": ga_time if best_fitness >= 0 else None,
+    }
+
+
+def run_case(module_name: str, sections: int, teacher_pool: int, seed: int, samples: int = SAMPLES,
+             generations: Optional[int] = None, population_size: Optional[int] = None) -> Dict:
+    with tempfile.TemporaryDirectory() as instance_dir:
+        generate_instance(os.path.join(instance_dir, "Data"), sections, teacher_pool, seed)
+        issues = analyze(os.path.join(instance_dir, "Data"))
+        command = [sys.executable, os.path.abspath(__file__), "--worker", module_name,
+                   "--seed", str(seed), "--samples", str(samples)]
+        if generations is not None:
+            command += ["--generations", str(generations)]
+        if population_size is not None:
+            command += ["--population-size", str(population_size)]
+        # A fresh process per case keeps peak memory and module globals independent
+        completed = subprocess.run(command, cwd=instance_dir, capture_output=True, text=True, check=True)
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result.update({"module": module_name, "sections": sections, "teacher_pool": teacher_pool, "seed": seed,
+                   # Fitness ignores teacher clashes, so a result only means something on a feasible instance
+                   "feasible": not issues, "infeasibility": [f"[{issue.check}] {issue.message}" for issue in issues]})
+    return result
+
+
+def run_benchmark(modules: List[str], sizes: List[int], teacher_ratios: List[float], seeds: List[int],
+                  samples: int = SAMPLES, generations: Optional[int] = None,
+                  population_size: Optional[int] = None) -> Dict:
+    results = []
+    for module_name in modules:
+        for sections in sizes:
+            for ratio in teacher_ratios:
+                teacher_pool = max(1, round(ratio * sections))
+                for seed in seeds:
+                    result = run_case(module_name, sections, teacher_pool, seed, samples,
+                                      generations, population_size)
+                    print(f"{module_name} sections={sections} teachers={teacher_pool} seed={seed}: "
+                          f"{result['evals_per_s']:.1f} evals/s, GA {result['ga_seconds']:.2f}s, "
+                          f"fitness {result['best_fitness']}"
+                          f"{'' if result['feasible'] else ' (instance infeasible)'}", file=sys.stderr)
+                    results.append(result)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark timetable GA versions on synthetic instances")
+    parser.add_argument("--modules", nargs="+", default=["engine"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=SECTION_SIZES)
+    parser.add_argument("--teacher-ratios", nargs="+", type=float, default=TEACHER_RATIOS,
+                        help="teachers per section")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--generations", type=int)
+    parser.add_argument("--population-size", type=int)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.seed, args.samples, args.generations, args.population_size)))
+        return
+
+    report = run_benchmark(args.modules, args.sizes, args.teacher_ratios, args.seeds,
+                           args.samples, args.generations, args.population_size)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import engine
+from export import FORMATS, export_timetables
+from feasibility import check
+
+
+def solve_dataset(data_dir: str, output_dir: str, seed: int, generations: int, population_size: int,
+                  patience: Optional[int], time_limit: Optional[float], max_evaluations: Optional[int],
+                  memetic: bool, formats: List[str]) -> Dict:
+    # Runs in a worker process: each process holds one dataset in the engine globals.
+    # Datasets that provably have no timetable fail here, before any GA work
+    check(data_dir)
+    start = time.time()
+    best, stop_reason = engine.run(data_dir, memetic, generations=generations, population_size=population_size,
+                                   patience=patience, time_limit=time_limit, max_evaluations=max_evaluations,
+                                   seed=seed)
+    elapsed = time.time() - start
+
+    written = export_timetables(best, output_dir, engine.DAYS, engine.TIMES, formats)
+    summary = {
+        "data_dir": os.path.abspath(data_dir),
+        "seed": seed,
+        "fitness": engine.calculate_fitness(best),
+        "stop_reason": stop_reason,
+        "seconds": elapsed,
+        "files": len(written),
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def output_names(data_dirs: List[str]) -> Dict[str, str]:
+    # Shortest trailing part of each dataset's path that no other dataset shares: d1/Data and d2/Data
+    # get d1/Data and d2/Data, while datasets with distinct directory names keep just that name
+    parts = {data_dir: os.path.realpath(data_dir).strip(os.sep).split(os.sep) for data_dir in data_dirs}
+    depth = dict.fromkeys(data_dirs, 1)
+    while True:
+        names = {data_dir: os.path.join(*parts[data_dir][-depth[data_dir]:]) for data_dir in data_dirs}
+        clashes = [data_dir for data_dir in data_dirs if list(names.values()).count(names[data_dir]) > 1]
+        deeper = [data_dir for data_dir in clashes if depth[data_dir] < len(parts[data_dir])]
+        if not deeper:
+            return names
+        for data_dir in deeper:
+            depth[data_dir] += 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate timetables without the Streamlit UI")
+    parser.add_argument("data_dirs", nargs="+",
+                        help="dataset directories holding rooms.csv, subjects.csv and sections.csv")
+    parser.add_argument("--output", default="output",
+                        help="output directory; with several datasets one subdirectory per dataset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generations", type=int, default=engine.GENERATIONS)
+    parser.add_argument("--population-size", type=int, default=engine.POPULATION_SIZE)
+    parser.add_argument("--patience", type=int, default=engine.PATIENCE)
+    parser.add_argument("--no-patience", dest="patience", action="store_const", const=None,
+                        help="run without the patience stop")
+    parser.add_argument("--time-limit", type=float, default=engine.TIME_LIMIT)
+    parser.add_argument("--max-evaluations", type=int, default=engine.MAX_EVALUATIONS)
+    parser.add_argument("--memetic", action="store_true", help="refine offspring with tabu local search")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["csv"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    resolved = [os.path.realpath(data_dir) for data_dir in args.data_dirs]
+    if len(set(resolved)) < len(resolved):
+        parser.error("each dataset directory may be given only once")
+
+    # Every dataset runs with the given seed, as in the service and the store: a dataset's timetable does
+    # not depend on the other datasets listed, the worker count or the completion order
+    jobs = {}
+    names = output_names(args.data_dirs)
+    for data_dir in args.data_dirs:
+        if len(args.data_dirs) == 1:
+            output_dir = args.output
+        else:
+            output_dir = os.path.join(args.output, names[data_dir])
+        jobs[data_dir] = output_dir
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as executor:
+        futures = {
+            executor.submit(solve_dataset, data_dir, output_dir, args.seed, args.generations,
+                            args.population_size, args.patience, args.time_limit, args.max_evaluations,
+                            args.memetic, args.formats): data_dir
+            for data_dir, output_dir in jobs.items()
+        }
+        for future in as_completed(futures):
+            data_dir = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"{data_dir}: failed: {e}", file=sys.stderr)
+                continue
+            print(f"{data_dir}: fitness {summary['fitness']} ({summary['stop_reason']}) "
+                  f"in {summary['seconds']:.2f}s -> {jobs[data_dir]}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
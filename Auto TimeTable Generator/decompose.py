@@ -0,0 +1,217 @@
+import argparse
+import csv
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+import engine
+from engine import Genome, read_rows
+from seeding import make_rng, spawn_seeds
+
+# Parameters
+WORKERS = os.cpu_count() or 1
+# Teachers listed for more than this fraction of all sections (common service staff) do not join
+# components together; their double bookings are resolved in the merge step instead
+SHARED_TEACHER_FRACTION = 0.5
+
+
+Rows = List[Dict[str, str]]
+
+
+def shared_teachers(section_rows: Rows, subject_rows: Rows, fraction: float = SHARED_TEACHER_FRACTION) -> Set[str]:
+    sections: Dict[str, Set[str]] = {}
+    for row in subject_rows:
+        for teacher in row["Teachers"].split(","):
+            sections.setdefault(teacher, set()).add(row["Section"])
+    return {teacher for teacher, taught in sections.items() if len(taught) > fraction * len(section_rows)}
+
+
+def conflict_components(section_rows: Rows, subject_rows: Rows, shared: Set[str] = frozenset()) -> List[List[str]]:
+    # Connected components of the section-teacher graph: a section is linked to every teacher
+    # listed for one of its subjects, so components only have the shared teachers in common
+    parent: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for row in section_rows:
+        find(("section", row["Section"]))
+    for row in subject_rows:
+        for teacher in row["Teachers"].split(","):
+            if teacher not in shared:
+                parent[find(("section", row["Section"]))] = find(("teacher", teacher))
+
+    components: Dict[Tuple[str, str], List[str]] = {}
+    for row in section_rows:
+        components.setdefault(find(("section", row["Section"])), []).append(row["Section"])
+    # Largest first, so the longest solves start first in the pool
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def write_component(data_dir: str, sections: List[str], output_dir: str) -> str:
+    # Sub-dataset for one component: its sections, subjects and pins. rooms.csv is shared since lab
+    # rooms are common to all, and so is the slot grid.
+    os.makedirs(output_dir, exist_ok=True)
+    wanted = set(sections)
+    for name in ("sections", "subjects", "pins"):
+        path = os.path.join(data_dir, f"{name}.csv")
+        if not os.path.exists(path):
+            continue
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            rows = [row for row in reader if row["Section"] in wanted]
+        with open(os.path.join(output_dir, f"{name}.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, reader.fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    for name in ("rooms", "slots"):
+        if os.path.exists(os.path.join(data_dir, f"{name}.csv")):
+            shutil.copyfile(os.path.join(data_dir, f"{name}.csv"), os.path.join(output_dir, f"{name}.csv"))
+    return output_dir
+
+
+def solve_component(data_dir: str, seed: int, generations: int, population_size: int,
+                    patience: Optional[int], time_limit: Optional[float], memetic: bool) -> Tuple[Genome, int]:
+    # Runs in a worker process holding only this component in the engine globals
+    best, _ = engine.run(data_dir, memetic, generations=generations, population_size=population_size,
+                         patience=patience, time_limit=time_limit, seed=seed)
+    return best, engine.calculate_fitness(best)
+
+
+def reconcile(parts: List[Genome], eligible: Dict[Tuple[str, str], List[str]], lab_rooms: List[str],
+              rng: Optional[random.Random] = None) -> Tuple[Genome, Dict[str, int]]:
+    # Merges component genomes and removes double bookings between components: a teacher or lab room
+    # already taken by an earlier component at any of a block's slots is swapped for a free alternative.
+    # Blocks are (section, subject, teacher) for teachers and one lab session for rooms, so a lecture
+    # and its lab keep sharing a teacher. Blocks holding a pinned gene are never changed. Returns the
+    # merged genome and the clashes left, by kind.
+    rng = rng or make_rng(0)
+    genome: Genome = []
+    teacher_busy: Dict[Tuple[str, str, str], int] = {}
+    room_busy: Dict[Tuple[str, str, str], int] = {}
+    unresolved = {"teacher": 0, "lab_room": 0}
+
+    def free(busy, resource, slots, component):
+        return all(busy.get((resource, day, time), component) == component for day, time in slots)
+
+    def pinned(indices):
+        return any(engine.MODEL.is_pinned(genome[i]) for i in indices)
+
+    def replace(indices, field, value):
+        for i in indices:
+            gene = list(genome[i])
+            gene[field] = value
+            genome[i] = tuple(gene)
+
+    for component, part in enumerate(parts):
+        offset = len(genome)
+        genome += part
+
+        teacher_blocks: Dict[Tuple[str, str, str], List[int]] = {}
+        room_blocks: Dict[Tuple[str, str, str, str], List[int]] = {}
+        for i, (day, _, section, subject, teacher, room) in enumerate(part, offset):
+            if subject == "Free":
+                continue
+            if teacher != "N/A":
+                teacher_blocks.setdefault((section, subject.replace(" Lab", ""), teacher), []).append(i)
+            if subject.endswith("Lab"):
+                room_blocks.setdefault((section, day, subject, room), []).append(i)
+
+        for (section, subject, teacher), indices in teacher_blocks.items():
+            slots = [genome[i][:2] for i in indices]
+            if not free(teacher_busy, teacher, slots, component):
+                candidates = [] if pinned(indices) else [t for t in eligible.get((section, subject), [])
+                                                         if t != teacher]
+                rng.shuffle(candidates)
+                alternative = next((t for t in candidates if free(teacher_busy, t, slots, component)), None)
+                if alternative is None:
+                    unresolved["teacher"] += 1
+                else:
+                    replace(indices, 4, alternative)
+                    teacher = alternative
+            for day, time_ in slots:
+                teacher_busy.setdefault((teacher, day, time_), component)
+
+        for (section, day, subject, room), indices in room_blocks.items():
+            slots = [genome[i][:2] for i in indices]
+            if not free(room_busy, room, slots, component):
+                candidates = [] if pinned(indices) else [r for r in lab_rooms if r != room]
+                rng.shuffle(candidates)
+                alternative = next((r for r in candidates if free(room_busy, r, slots, component)), None)
+                if alternative is None:
+                    unresolved["lab_room"] += 1
+                else:
+                    replace(indices, 5, alternative)
+                    room = alternative
+            for day_, time_ in slots:
+                room_busy.setdefault((room, day_, time_), component)
+
+    return genome, unresolved
+
+
+def solve_decomposed(data_dir: str, seed: int = 0, workers: int = WORKERS,
+                     generations: int = engine.GENERATIONS, population_size: int = engine.POPULATION_SIZE,
+                     patience: Optional[int] = engine.UNSET, time_limit: Optional[float] = engine.UNSET,
+                     memetic: bool = False, shared_fraction: float = SHARED_TEACHER_FRACTION) -> Tuple[Genome, Dict]:
+    # Plans components, solves each in its own process and merges them; leaves the full
+    # dataset loaded in this process so the merged genome can be scored and displayed.
+    # Stop parameters are resolved here, since the UNSET marker does not survive pickling
+    patience = engine.PATIENCE if patience is engine.UNSET else patience
+    time_limit = engine.TIME_LIMIT if time_limit is engine.UNSET else time_limit
+    section_rows = read_rows(os.path.join(data_dir, "sections.csv"))
+    subject_rows = read_rows(os.path.join(data_dir, "subjects.csv"))
+    shared = shared_teachers(section_rows, subject_rows, shared_fraction)
+    components = conflict_components(section_rows, subject_rows, shared)
+    seeds = spawn_seeds(seed, len(components) + 1)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        component_dirs = [write_component(data_dir, sections, os.path.join(scratch, str(i)))
+                          for i, sections in enumerate(components)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(components))) as executor:
+            futures = [executor.submit(solve_component, component_dir, component_seed, generations,
+                                       population_size, patience, time_limit, memetic)
+                       for component_dir, component_seed in zip(component_dirs, seeds)]
+            results = [future.result() for future in futures]
+
+    engine.load_data(data_dir)
+    eligible = {(row["Section"], row["Subject"].replace(" Lab", "")): row["Teachers"].split(",")
+                for row in subject_rows}
+    genome, unresolved = reconcile([part for part, _ in results], eligible, engine.LAB_ROOMS,
+                                   make_rng(seeds[-1]))
+    return genome, {
+        "components": [len(sections) for sections in components],
+        "shared_teachers": sorted(shared),
+        "component_fitness": [fitness for _, fitness in results],
+        "fitness": engine.calculate_fitness(genome),
+        "unresolved_clashes": unresolved,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve independent section groups in parallel and merge them")
+    parser.add_argument("data_dir", nargs="?", default=engine.DATA_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--memetic", action="store_true", help="refine offspring with tabu local search")
+    parser.add_argument("--shared-fraction", type=float, default=SHARED_TEACHER_FRACTION,
+                        help="teachers listed for more than this fraction of sections are reconciled, not grouped")
+    args = parser.parse_args()
+
+    start = time.time()
+    _, summary = solve_decomposed(args.data_dir, seed=args.seed, workers=args.workers, memetic=args.memetic,
+                                  shared_fraction=args.shared_fraction)
+    print(f"Components (sections): {summary['components']}, shared teachers: {len(summary['shared_teachers'])}")
+    print(f"Fitness: {summary['fitness']}, unresolved clashes: {summary['unresolved_clashes']}")
+    print(f"Time taken: {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
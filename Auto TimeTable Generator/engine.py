@@ -0,0 +1,616 @@
+import csv
+import os
+import random
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from adaptive import AdaptiveControl, population_diversity
+from problem import Pins, ProblemModel
+from seeding import make_rng, resolve_rng, spawn_seeds
+from slots import SlotGrid, default_grid, load_grid, load_pins
+from telemetry import GenerationCallback, GenerationStats, summarize_scores
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data")
+
+
+# Problem data bound by load_data (or bind_data); nothing is read at import time.
+# The slot grid (DAYS, TIMES and the fixed slots) is part of the dataset too.
+DATA_GLOBALS = ("ROOMS", "SUBJECTS", "SUBJECT_HOURS", "TEACHERS", "LAB_ROOMS", "MODEL", "GRID", "DAYS", "TIMES")
+
+
+def read_rows(path: str) -> List[Dict[str, str]]:
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def load_data(data_dir: str = DATA_DIR):
+    # (Re)binds the problem globals the GA functions read, so one process can solve any dataset.
+    # CSV data is read with the csv module: engine imports stay free of pandas
+    rooms = read_rows(os.path.join(data_dir, 'rooms.csv'))
+    subjects = read_rows(os.path.join(data_dir, 'subjects.csv'))
+    sections = read_rows(os.path.join(data_dir, 'sections.csv'))
+
+    bind_data({row['Section']: row['Room'] for row in sections},
+              [(row['Subject'], int(row['Hours']), row['Teachers'].split(',')) for row in subjects],
+              [row['Room'] for row in rooms if row['Type'] == 'Lab'],
+              load_grid(data_dir), load_pins(data_dir))
+
+
+def bind_data(rooms: Dict[str, str], subjects: List[Tuple[str, int, List[str]]], lab_rooms: List[str],
+              grid: Optional[SlotGrid] = None, pins: Iterable[Sequence[Optional[str]]] = ()):
+    # Shared by every data source: section -> home room, (subject, hours, teachers) rows, lab rooms,
+    # the slot grid (the default five-day week when not given) and pinned genes (besides PINNED_GENES)
+    global ROOMS, SUBJECTS, SUBJECT_HOURS, TEACHERS, LAB_ROOMS, MODEL, GRID, DAYS, TIMES
+
+    GRID = grid or default_grid()
+    DAYS, TIMES = GRID.days, GRID.times
+    ROOMS = dict(rooms)
+    SUBJECTS = list(dict.fromkeys(subject for subject, _, _ in subjects))
+
+    # Create SUBJECT_HOURS and TEACHERS dictionaries
+    SUBJECT_HOURS = {}
+    TEACHERS = {}
+    for subject, hours, teachers in subjects:
+        SUBJECT_HOURS[subject] = hours
+        TEACHERS[subject] = list(teachers)
+
+    LAB_ROOMS = list(lab_rooms)
+
+    # Indexed eligibility matrices used for candidate selection
+    MODEL = ProblemModel(ROOMS.keys(), SUBJECTS, TEACHERS, GRID, resolve_pins(list(pins) + list(PINNED_GENES)))
+
+
+def resolve_pins(pins: Iterable[Sequence[Optional[str]]]) -> Pins:
+    # The grid's fixed slots pin every section; explicit (section, day, time, subject[, teacher, room])
+    # pins override them. A missing teacher is the subject's first listed teacher ("N/A" outside the
+    # dataset), a missing room the section's home room, or the first lab room for labs.
+    resolved = {section: {slot: (subject, "N/A", room) for slot, subject in GRID.fixed.items()}
+                for section, room in ROOMS.items()}
+    for section, day, time, subject, *rest in pins:
+        teacher, room = (list(rest) + [None, None])[:2]
+        if section not in ROOMS:
+            raise ValueError(f"Pinned section {section} is not in the dataset")
+        if day not in GRID.day_index or time not in GRID.period:
+            raise ValueError(f"Pinned slot {day} {time} is not in the slot grid")
+        if not teacher:
+            teacher = TEACHERS[subject][0] if subject in TEACHERS else "N/A"
+        if not room:
+            room = LAB_ROOMS[0] if subject.endswith("Lab") and LAB_ROOMS else ROOMS[section]
+        resolved[section][(day, time)] = (subject, teacher, room)
+    return resolved
+
+
+# Parameters
+POPULATION_SIZE = 10
+GENERATIONS = 100
+MUTATION_RATE = 0.01
+
+# Termination: stop as soon as any of these is hit (None disables a criterion)
+TARGET_FITNESS = 0        # no violations left
+PATIENCE = 20             # generations without improvement of the best fitness
+TIME_LIMIT = None         # wall-clock budget in seconds
+MAX_EVALUATIONS = None    # budget of fitness evaluations, local search neighbours included
+# Default of the stop arguments: the module parameter above, read at call time (None disables)
+UNSET = object()
+
+# Operator control: adapt mutation strength and crossover probability to diversity
+ADAPTIVE = True
+
+# Constructive initializer: backtracking budget per section and restarts before relaxing
+CONSTRUCT_NODE_LIMIT = 500
+CONSTRUCT_ATTEMPTS = 20
+
+# Extra pinned genes on top of the dataset's pins.csv: (section, day, time, subject[, teacher, room])
+PINNED_GENES: List[Tuple[str, ...]] = []
+
+# Targeted mutation: chance of picking a conflicted gene when the conflict index has any
+CONFLICT_BIAS = 0.9
+
+# Genome representation: List of tuples (day, time, section, subject, teacher, room)
+Gene = Tuple[str, str, str, str, str, str]
+Genome = List[Gene]
+# Gene index -> names of the violated constraints it takes part in
+ConflictIndex = Dict[int, List[str]]
+
+
+def ensure_data():
+    # The default dataset is read on first use rather than on import
+    if "MODEL" not in globals():
+        load_data()
+
+
+def __getattr__(name: str):
+    # engine.ROOMS and friends from other modules also trigger the lazy load
+    if name in DATA_GLOBALS:
+        ensure_data()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def generate_genome(rng: Optional[random.Random] = None) -> Genome:
+    ensure_data()
+    rng = resolve_rng(rng)
+    genome = []
+    subject_hours_remaining = {
+        section: SUBJECT_HOURS.copy() for section in ROOMS.keys()}
+    teacher_assignment = {section: {} for section in ROOMS.keys()}
+    # Bitset of the teachers assigned so far in each section, kept in step with teacher_assignment
+    teachers_in_use = {section: 0 for section in ROOMS.keys()}
+
+    for section in ROOMS.keys():
+        section_start = len(genome)
+        labs_scheduled = set()
+        pins = MODEL.pins[section]
+        # Pinned classes count towards the section's hours, fix the subject's teacher and use up its day
+        pinned_days = {}
+        for (day, _), (subject, teacher, _) in pins.items():
+            if subject not in SUBJECT_HOURS:
+                continue
+            subject_hours_remaining[section][subject] = max(0, subject_hours_remaining[section][subject] - 1)
+            if teacher != "N/A":
+                teacher_assignment[section][subject] = teacher
+                teacher_assignment[section][subject.replace(" Lab", "")] = teacher
+                teachers_in_use[section] |= MODEL.teacher_bit(teacher)
+            if not subject.endswith("Lab"):
+                pinned_days.setdefault(day, set()).add(subject)
+
+        for day in DAYS:
+            day_subjects = set(pinned_days.get(day, ()))
+            for time in TIMES:
+                # Pinned genes (fixed second language and English slots included) are copied as they are
+                pin = pins.get((day, time))
+                if pin is not None:
+                    genome.append((day, time, section) + pin)
+                    continue
+
+                if not any(subject_hours_remaining[section].values()):
+                    genome.append(
+                        (day, time, section, "Free", "N/A", ROOMS[section]))
+                    continue
+
+                available_subjects = [subject for subject, hours in subject_hours_remaining[section].items(
+                ) if hours > 0 and subject not in day_subjects]
+
+                if not available_subjects:
+                    genome.append(
+                        (day, time, section, "Free", "N/A", ROOMS[section]))
+                    continue
+
+                subject = rng.choice(available_subjects)
+
+                if subject in teacher_assignment[section]:
+                    teacher = teacher_assignment[section][subject]
+                else:
+                    if subject.endswith("Lab"):
+                        base_subject = subject.replace(" Lab", "")
+                        if base_subject in teacher_assignment[section]:
+                            teacher = teacher_assignment[section][base_subject]
+                        else:
+                            teacher = rng.choice(TEACHERS[subject])
+                            teacher_assignment[section][subject] = teacher
+                            teacher_assignment[section][base_subject] = teacher
+                    else:
+                        # Ensure teacher isn't already teaching another subject for this section,
+                        # falling back to any teacher if all are used
+                        teacher = MODEL.sample_teacher(subject, teachers_in_use[section], rng)
+                        teacher_assignment[section][subject] = teacher
+                    teachers_in_use[section] |= MODEL.teacher_bit(teacher)
+
+                if subject.endswith("Lab"):
+                    next_time = GRID.next_time[time]
+                    if subject not in labs_scheduled and subject_hours_remaining[section][subject] >= 2 and \
+                            next_time and (day, next_time) not in pins:
+                        lab_room = rng.choice(LAB_ROOMS)
+                        genome.append(
+                            (day, time, section, subject, teacher, lab_room))
+                        genome.append(
+                            (day, next_time, section, subject, teacher, lab_room))
+                        subject_hours_remaining[section][subject] -= 2
+                        labs_scheduled.add(subject)
+                        break  # Skip next time slot
+                    else:
+                        genome.append(
+                            (day, time, section, "Free", "N/A", ROOMS[section]))
+                else:
+                    genome.append(
+                        (day, time, section, subject, teacher, ROOMS[section]))
+                    subject_hours_remaining[section][subject] -= 1
+                    day_subjects.add(subject)
+
+        # Fill any remaining slots with "Free", or their pinned gene
+        filled = {(gene[0], gene[1]) for gene in genome[section_start:]}
+        if len(filled) < GRID.slots:
+            for day in DAYS:
+                for time in TIMES:
+                    if (day, time) not in filled:
+                        genome.append(
+                            (day, time, section) + pins.get((day, time), ("Free", "N/A", ROOMS[section])))
+        # Canonical (day, time) order within the section, which crossover and the pin mask rely on
+        genome[section_start:] = sorted(genome[section_start:],
+                                        key=lambda gene: (GRID.day_index[gene[0]], GRID.period[gene[1]]))
+    return genome
+
+def construct_section(section: str, teacher_busy: set, lab_room_busy: set,
+                      node_limit: int = CONSTRUCT_NODE_LIMIT,
+                      rng: Optional[random.Random] = None) -> Optional[List[Gene]]:
+    rng = resolve_rng(rng)
+    grid = {}  # (day, time) -> (subject, teacher, room)
+
+    # Pinned genes (fixed slots included) are placed before anything else is propagated;
+    # their classes count towards the subject's hours and fix its teacher
+    grid.update(MODEL.pins[section])
+    hours = dict(SUBJECT_HOURS)
+    teachers = {}
+    in_use = 0
+    for subject, teacher, _ in MODEL.pins[section].values():
+        if subject in hours:
+            hours[subject] = max(0, hours[subject] - 1)
+            if teacher != "N/A":
+                teachers[subject] = teachers[subject.replace(" Lab", "")] = teacher
+                in_use |= MODEL.teacher_bit(teacher)
+
+    # One teacher per subject for the section, shared by a lab and its lecture,
+    # preferring teachers not already used by another subject of this section
+    for subject in SUBJECTS:
+        base_subject = subject.replace(" Lab", "")
+        if base_subject in teachers:
+            teachers[subject] = teachers[base_subject]
+            continue
+        teachers[subject] = teachers[base_subject] = MODEL.sample_teacher(subject, in_use, rng)
+        in_use |= MODEL.teacher_bit(teachers[subject])
+
+    # Labs first (two consecutive slots each), then single lecture hours, busiest subjects first
+    tasks = []
+    for subject in SUBJECTS:
+        if subject.endswith("Lab"):
+            tasks += [(subject, 2)] * (hours[subject] // 2) + [(subject, 1)] * (hours[subject] % 2)
+    for subject in sorted(SUBJECTS, key=lambda s: hours[s], reverse=True):
+        if not subject.endswith("Lab"):
+            tasks += [(subject, 1)] * hours[subject]
+
+    def teacher_free(teacher: str, day: str, time: str) -> bool:
+        return (teacher, day, time) not in teacher_busy
+
+    def lecture_days(subject: str) -> List[str]:
+        # Days where the subject is not taught yet and a slot is open for its teacher
+        used_days = {day for (day, _), gene in grid.items() if gene[0] == subject}
+        return [day for day in DAYS if day not in used_days and
+                any((day, time) not in grid and teacher_free(teachers[subject], day, time) for time in TIMES)]
+
+    def options(subject: str, length: int) -> List[Tuple[str, List[str], str]]:
+        teacher = teachers[subject]
+        result = []
+        if subject.endswith("Lab"):
+            for day in DAYS:
+                # Lab pairs at the end of the day come first: nothing follows to break the pair
+                for start in reversed(range(len(TIMES) - length + 1)):
+                    times = TIMES[start:start + length]
+                    if any((day, time) in grid or not teacher_free(teacher, day, time) for time in times):
+                        continue
+                    rooms = [room for room in LAB_ROOMS
+                             if all((room, day, time) not in lab_room_busy for time in times)]
+                    if rooms:
+                        result.append((day, times, rng.choice(rooms)))
+            result.sort(key=lambda option: (GRID.period[option[1][-1]], rng.random()), reverse=True)
+            return result
+
+        # Spread lectures over the emptiest days so no day is left free
+        load = dict.fromkeys(DAYS, 0)
+        for day, _ in grid:
+            load[day] += 1
+        for day in sorted(lecture_days(subject), key=lambda d: (load[d], rng.random())):
+            times = [time for time in TIMES if (day, time) not in grid and teacher_free(teacher, day, time)]
+            result.append((day, [rng.choice(times)], ROOMS[section]))
+        return result
+
+    def remaining_feasible(position: int) -> bool:
+        # Forward check: every lecture subject still has enough distinct days for its hours
+        remaining = {}
+        for subject, _ in tasks[position:]:
+            if not subject.endswith("Lab"):
+                remaining[subject] = remaining.get(subject, 0) + 1
+        return all(len(lecture_days(subject)) >= hours for subject, hours in remaining.items())
+
+    nodes = 0
+
+    def search(position: int) -> bool:
+        nonlocal nodes
+        if position == len(tasks):
+            return True
+        nodes += 1
+        if nodes > node_limit:
+            return False
+        subject, length = tasks[position]
+        for day, times, room in options(subject, length):
+            for time in times:
+                grid[(day, time)] = (subject, teachers[subject], room)
+            if remaining_feasible(position + 1) and search(position + 1):
+                return True
+            for time in times:
+                del grid[(day, time)]
+        return False
+
+    if not search(0):
+        return None
+    # Constraint: No full day free
+    if any(all((day, time) not in grid for time in TIMES) for day in DAYS):
+        return None
+
+    genes = []
+    for day in DAYS:
+        for time in TIMES:
+            subject, teacher, room = grid.get((day, time), ("Free", "N/A", ROOMS[section]))
+            genes.append((day, time, section, subject, teacher, room))
+    return genes
+
+
+def construct_genome(attempts: int = CONSTRUCT_ATTEMPTS, rng: Optional[random.Random] = None) -> Genome:
+    # Section by section with teacher and lab room occupancy shared across sections;
+    # a section that cannot be completed is restarted with fresh random choices
+    ensure_data()
+    genome = []
+    # Pinned teachers and lab rooms are taken up front, so no earlier section can claim them
+    teacher_busy = {(teacher, day, time) for slots in MODEL.pins.values()
+                    for (day, time), (_, teacher, _) in slots.items() if teacher != "N/A"}
+    lab_room_busy = {(room, day, time) for slots in MODEL.pins.values()
+                     for (day, time), (subject, _, room) in slots.items() if subject.endswith("Lab")}
+
+    for section in ROOMS.keys():
+        for _ in range(attempts):
+            genes = construct_section(section, teacher_busy, lab_room_busy, rng=rng)
+            if genes is not None:
+                break
+        else:
+            # Over-constrained: drop cross-section occupancy rather than fail, the GA repairs the rest
+            genes = construct_section(section, set(), set(), node_limit=CONSTRUCT_NODE_LIMIT * attempts, rng=rng)
+            if genes is None:
+                raise ValueError(f"Section {section} cannot be scheduled within {GRID.slots} slots")
+
+        for day, time, _, subject, teacher, room in genes:
+            if subject == "Free":
+                continue
+            if teacher != "N/A":
+                teacher_busy.add((teacher, day, time))
+            if subject.endswith("Lab"):
+                lab_room_busy.add((room, day, time))
+        genome += genes
+
+    return genome
+
+
+def calculate_fitness(genome: Genome, with_conflicts: bool = False) -> Union[int, Tuple[int, ConflictIndex]]:
+    # With with_conflicts, also returns which genes take part in which violated constraint
+    fitness = 0
+    conflicts: ConflictIndex = {}
+
+    def flag(indices, constraint):
+        for i in indices:
+            conflicts.setdefault(i, []).append(constraint)
+
+    section_days = {}
+    for index, entry in enumerate(genome):
+        section_days.setdefault((entry[2], entry[0]), []).append(index)
+
+    for section in ROOMS.keys():
+        for day in DAYS:
+            daily_schedule = section_days.get((section, day), [])
+
+            # Constraint: No subject repeats more than once per day (except labs)
+            subjects_today = [genome[i][3] for i in daily_schedule
+                              if not genome[i][3].endswith("Lab") and genome[i][3] != "Free"]
+            if len(subjects_today) != len(set(subjects_today)):
+                fitness -= 10
+                repeated = {subject for subject in subjects_today if subjects_today.count(subject) > 1}
+                flag([i for i in daily_schedule if genome[i][3] in repeated], "repeat")
+
+            # Constraint: Labs should be scheduled consecutively. Pinned genes are exempt from this
+            # and the room check: no operator may change them, so their penalty could never be repaired
+            ordered = sorted(daily_schedule, key=lambda i: GRID.period[genome[i][1]])
+            for current, next_slot in zip(ordered, ordered[1:]):
+                if genome[current][3].endswith("Lab") and not MODEL.is_pinned(genome[current]):
+                    if not (genome[next_slot][3] == genome[current][3] and genome[next_slot][5] == genome[current][5]):
+                        fitness -= 5
+                        flag([current, next_slot], "lab_pair")
+
+            # Constraint: Correct room assignments
+            for i in daily_schedule:
+                subject, room = genome[i][3], genome[i][5]
+                if MODEL.is_pinned(genome[i]):
+                    continue
+                if subject.endswith("Lab") and room not in LAB_ROOMS:
+                    fitness -= 5
+                    flag([i], "room")
+                elif not subject.endswith("Lab") and room != ROOMS[section]:
+                    fitness -= 5
+                    flag([i], "room")
+
+            # Constraint: No full day free
+            if all(genome[i][3] == "Free" for i in daily_schedule):
+                fitness -= 10
+                flag(daily_schedule, "free_day")
+
+    return (fitness, conflicts) if with_conflicts else fitness
+
+
+def inherited_conflicts(child: Genome, parents: Tuple[Genome, ...], conflicts: Tuple[ConflictIndex, ...]) -> ConflictIndex:
+    # Conflict hint for a child without re-scoring it: a parent's conflicted gene that the child kept
+    inherited = {}
+    for parent, parent_conflicts in zip(parents, conflicts):
+        for i, constraints in parent_conflicts.items():
+            if i < len(child) and child[i] is parent[i]:
+                inherited[i] = constraints
+    return inherited
+
+
+def select_parents(population: List[Genome]) -> Tuple[Genome, Genome]:
+    fitness_scores = sorted(population, key=calculate_fitness, reverse=True)
+    return fitness_scores[0], fitness_scores[1]
+
+
+def crossover(parent1: Genome, parent2: Genome, rng: Optional[random.Random] = None) -> Tuple[Genome, Genome]:
+    rng = resolve_rng(rng)
+    # Both initializers emit the canonical (section, day, time) layout and mutation keeps slots in
+    # place, so parents line up position by position and pinned genes match on both sides of the cut
+    point = rng.randint(1, len(parent1) - 2)
+    child1 = parent1[:point] + parent2[point:]
+    child2 = parent2[:point] + parent1[point:]
+    return child1, child2
+
+
+def mutate(genome: Genome, rng: Optional[random.Random] = None, conflicts: Optional[ConflictIndex] = None) -> Genome:
+    rng = resolve_rng(rng)
+    mutated_genome = genome.copy()
+    # Genes already in a violated constraint are picked first; the rest of the time any gene.
+    # Pinned genes are masked out of both draws.
+    targets = [i for i in conflicts if not MODEL.is_pinned(genome[i])] if conflicts else []
+    if targets and rng.random() < CONFLICT_BIAS:
+        index = rng.choice(targets)
+    else:
+        index = MODEL.unlocked_index(genome, rng)
+        if index < 0:
+            return mutated_genome
+    day, time, section, _, _, _ = mutated_genome[index]
+
+    available_subjects = SUBJECTS + ["Free"]
+    subject = rng.choice(available_subjects)
+
+    if subject == "Free":
+        teacher = "N/A"
+        room = ROOMS[section]
+    elif subject.endswith("Lab"):
+        teacher = rng.choice(TEACHERS[subject])
+        room = rng.choice(LAB_ROOMS)
+    else:
+        # Ensure the mutated subject's teacher is not already teaching another subject in the same section
+        teacher = MODEL.sample_teacher(subject, MODEL.section_teacher_bits(genome, section), rng)
+        room = ROOMS[section]
+
+    mutated_genome[index] = (day, time, section, subject, teacher, room)
+    return mutated_genome
+
+
+def genetic_algorithm(target_fitness: Optional[int] = UNSET,
+                      patience: Optional[int] = UNSET,
+                      time_limit: Optional[float] = UNSET,
+                      max_evaluations: Optional[int] = UNSET,
+                      on_generation: Optional[GenerationCallback] = None,
+                      adaptive: bool = ADAPTIVE,
+                      improve: Optional[Callable[..., Tuple[Genome, int, int]]] = None,
+                      initializer: Callable[..., Genome] = construct_genome,
+                      seed: Optional[int] = None,
+                      generations: Optional[int] = None,
+                      population_size: Optional[int] = None) -> Tuple[Genome, str]:
+    # A seed gives the run its own generator; without one the shared random module is used.
+    # Parameters left out take the module parameters, read at call time
+    ensure_data()
+    target_fitness = TARGET_FITNESS if target_fitness is UNSET else target_fitness
+    patience = PATIENCE if patience is UNSET else patience
+    time_limit = TIME_LIMIT if time_limit is UNSET else time_limit
+    max_evaluations = MAX_EVALUATIONS if max_evaluations is UNSET else max_evaluations
+    generations = GENERATIONS if generations is None else generations
+    population_size = POPULATION_SIZE if population_size is None else population_size
+    # The evaluation budget covers the initial population too: it is cut to the budget
+    if max_evaluations is not None:
+        population_size = max(1, min(population_size, max_evaluations))
+    rng = make_rng(seed) if seed is not None else resolve_rng(None)
+    # Diversity sampling has its own stream, so attaching a telemetry callback leaves the run unchanged
+    diversity_rng = make_rng(spawn_seeds(seed, 1)[0] if seed is not None else None)
+    start = time.time()
+    population = [initializer(rng=rng) for _ in range(population_size)]
+    # Scoring also yields each genome's conflict index, which steers its children's mutations
+    scores, conflicts = map(list, zip(*[calculate_fitness(genome, with_conflicts=True) for genome in population]))
+    evaluations = len(population)
+
+    best_fitness = max(scores)
+    stale_generations = 0
+    stop_reason = "generations"
+    # Without adaptation the defaults reproduce the plain loop: always cross over, one gene per mutation
+    control = AdaptiveControl()
+
+    for generation in range(generations):
+        if target_fitness is not None and best_fitness >= target_fitness:
+            stop_reason = "target_fitness"
+            break
+        if patience is not None and stale_generations >= patience:
+            stop_reason = "patience"
+            break
+        if time_limit is not None and time.time() - start >= time_limit:
+            stop_reason = "time_limit"
+            break
+        if max_evaluations is not None and evaluations + 2 > max_evaluations:
+            stop_reason = "max_evaluations"
+            break
+
+        # Population is kept sorted, so the two fittest genomes lead it (same as select_parents)
+        t0 = time.perf_counter()
+        ranked = sorted(zip(scores, population, conflicts), key=lambda x: x[0], reverse=True)
+        parents = ranked[0][1], ranked[1][1]
+        parent_conflicts = ranked[0][2], ranked[1][2]
+        t1 = time.perf_counter()
+        if rng.random() < control.crossover_rate:
+            child1, child2 = crossover(parents[0], parents[1], rng)
+        else:
+            child1, child2 = parents
+        t2 = time.perf_counter()
+        children = []
+        for child in (child1, child2):
+            if rng.random() < control.mutation_rate:
+                hint = inherited_conflicts(child, parents, parent_conflicts)
+                for _ in range(control.mutation_strength):
+                    child = mutate(child, rng, hint)
+            children.append(child)
+        t3 = time.perf_counter()
+        offspring = [calculate_fitness(child, with_conflicts=True) + (child,) for child in children]
+        offspring = [(score, child, child_conflicts) for score, child_conflicts, child in offspring]
+        evaluations += len(children)
+        # Memetic step: local search refines the better child and returns its exact fitness and the
+        # evaluations it spent, within what is left of the budget once the refined genome's re-scoring
+        # (for its conflict index) is reserved
+        budget = None if max_evaluations is None else max_evaluations - evaluations - 1
+        if improve is not None and (budget is None or budget > 0):
+            offspring.sort(key=lambda x: x[0], reverse=True)
+            improved, score, spent = improve(offspring[0][1], rng=rng, max_evaluations=budget)
+            offspring[0] = (score, improved, calculate_fitness(improved, with_conflicts=True)[1])
+            evaluations += spent + 1
+        ranked += offspring
+        t4 = time.perf_counter()
+
+        ranked = sorted(ranked, key=lambda x: x[0], reverse=True)[:population_size]
+        scores = [score for score, _, _ in ranked]
+        population = [genome for _, genome, _ in ranked]
+        conflicts = [genome_conflicts for _, _, genome_conflicts in ranked]
+        selection_time = t1 - t0 + time.perf_counter() - t4
+
+        if scores[0] > best_fitness:
+            best_fitness = scores[0]
+            stale_generations = 0
+        else:
+            stale_generations += 1
+
+        diversity = population_diversity(population, rng=diversity_rng) if adaptive or on_generation is not None else None
+        if adaptive:
+            control.update(diversity, stale_generations)
+
+        if on_generation is not None:
+            on_generation(GenerationStats(
+                generation=generation,
+                diversity=diversity,
+                evaluations=evaluations,
+                selection_time=selection_time,
+                crossover_time=t2 - t1,
+                mutation_time=t3 - t2,
+                fitness_time=t4 - t3,
+                **summarize_scores(scores)))
+
+    best_index = max(range(len(population)), key=lambda i: scores[i])
+    return population[best_index], stop_reason
+
+
+def run(data_dir: Optional[str] = None, memetic: bool = False, **options) -> Tuple[Genome, str]:
+    # One solve as the front ends (cli, service, decompose, store) run it: optionally load a dataset
+    # (None keeps the bound one), pick the memetic local search, and pass the rest to genetic_algorithm
+    if data_dir is not None:
+        load_data(data_dir)
+    improve = None
+    if memetic:
+        from memetic import local_search
+        improve = local_search
+    return genetic_algorithm(improve=improve, **options)
@@ -0,0 +1,156 @@
+import os
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COLUMNS = ["day", "time", "section", "subject", "teacher", "room"]
+FORMATS = ["csv", "parquet", "ics"]
+
+# Bell times are written without am/pm ("1:40-2:30"); anything before this hour is afternoon
+FIRST_MORNING_HOUR = 8
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def genome_frame(genome: Sequence[Tuple[str, ...]]) -> "pd.DataFrame":
+    # One row per gene, with the display cell computed column-wise; pandas is imported here so
+    # that importing export (for FORMATS, say) stays cheap
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(list(genome), columns=COLUMNS)
+    df["cell"] = np.where(df["subject"] == "Free", "Free",
+                          df["subject"] + "\n" + df["teacher"] + "\n" + df["room"])
+    # A slot written twice keeps its last gene, like the per-cell .at writes did
+    return df.drop_duplicates(["section", "day", "time"], keep="last")
+
+
+def timetable_frames(genome: Sequence[Tuple[str, ...]], days: List[str], times: List[str]) -> Dict[str, "pd.DataFrame"]:
+    # Times x days grid for every section, built with a single unstack
+    df = genome_frame(genome)
+    grid = df.set_index(["section", "time", "day"])["cell"].unstack("day").reindex(columns=days)
+    return {section: grid.xs(section).reindex(index=times) for section in grid.index.unique(level="section")}
+
+
+def parse_period(period: str) -> Tuple[time, time]:
+    start, end = [re.match(r"(\d+):(\d+)", part.strip()).groups() for part in period.split("-")]
+    clock = []
+    for hour, minute in (start, end):
+        hour = int(hour)
+        if hour < FIRST_MORNING_HOUR:
+            hour += 12
+        clock.append(time(hour, int(minute)))
+    return clock[0], clock[1]
+
+
+def week_start_date(today: Optional[date] = None) -> date:
+    today = today or date.today()
+    return today - timedelta(days=today.weekday())
+
+
+def calendar_days(days: List[str]) -> Tuple[Dict[str, int], int]:
+    # Offset from the week start of every day label and the rotation length in weeks. Labels end in a
+    # weekday name ("Saturday", "B Monday"); a weekday that does not move forward starts the next week.
+    offsets, week, previous = {}, 0, -1
+    for position, day in enumerate(days):
+        name = day.split()[-1] if day.strip() else day
+        if name not in WEEKDAYS:
+            offsets[day] = position
+            continue
+        weekday = WEEKDAYS.index(name)
+        if weekday <= previous:
+            week += 1
+        previous = weekday
+        offsets[day] = week * 7 + weekday
+    return offsets, week + 1
+
+
+def ics_text(value: str) -> str:
+    # RFC 5545 TEXT escaping: backslash first, then the separators and line breaks
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n"))
+
+
+def ics_fold(line: str, limit: int = 75) -> str:
+    # RFC 5545 folding: content lines longer than 75 octets (UTF-8) continue on lines starting
+    # with a space, never splitting a multi-byte character
+    parts, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append(current)
+            current, size = " ", 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n".join(parts)
+
+
+def ics_calendar(name: str, rows: "pd.DataFrame", days: List[str], week_start: date) -> str:
+    # Recurring events anchored on the given Monday; an A/B rotation repeats every other week
+    offsets, weeks = calendar_days(days)
+    rule = "RRULE:FREQ=WEEKLY" + (f";INTERVAL={weeks}" if weeks > 1 else "")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Timetable Generator//EN",
+             f"X-WR-CALNAME:{ics_text(name)}"]
+    for row in rows.itertuples(index=False):
+        start, end = parse_period(row.time)
+        day = week_start + timedelta(days=offsets[row.day])
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{ics_text(f'{row.section}-{row.day}-{row.time}-{row.room}@timetable'.replace(' ', ''))}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{datetime.combine(day, start).strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND:{datetime.combine(day, end).strftime('%Y%m%dT%H%M%S')}",
+            rule,
+            f"SUMMARY:{ics_text(f'{row.subject} ({row.section})')}",
+            f"LOCATION:{ics_text(row.room)}",
+            f"DESCRIPTION:{ics_text(f'Teacher: {row.teacher}')}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(ics_fold(line) for line in lines) + "\r\n"
+
+
+def safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_")
+
+
+def export_timetables(genome: Sequence[Tuple[str, ...]], output_dir: str, days: List[str], times: List[str],
+                      formats: Iterable[str] = FORMATS, week_start: Optional[date] = None) -> List[str]:
+    # Writes every section in one pass; returns the paths written
+    os.makedirs(output_dir, exist_ok=True)
+    df = genome_frame(genome)
+    # Sort by section, day and period rather than by string order
+    df = df.assign(day_index=df["day"].map({day: i for i, day in enumerate(days)}),
+                   time_index=df["time"].map({t: i for i, t in enumerate(times)}))
+    df = df.sort_values(["section", "day_index", "time_index"]).drop(columns=["day_index", "time_index"])
+    written = []
+
+    for fmt in formats:
+        if fmt == "csv":
+            path = os.path.join(output_dir, "timetable.csv")
+            df.drop(columns="cell").to_csv(path, index=False)
+            written.append(path)
+        elif fmt == "parquet":
+            # Needs pyarrow or fastparquet, like any pandas Parquet write
+            path = os.path.join(output_dir, "timetable.parquet")
+            df.drop(columns="cell").to_parquet(path, index=False)
+            written.append(path)
+        elif fmt == "ics":
+            week_start = week_start or week_start_date()
+            classes = df[df["subject"] != "Free"]
+            for column in ("teacher", "room"):
+                folder = os.path.join(output_dir, "ics", column)
+                os.makedirs(folder, exist_ok=True)
+                for name, rows in classes[classes[column] != "N/A"].groupby(column):
+                    path = os.path.join(folder, f"{safe_name(name)}.ics")
+                    with open(path, "w", newline="", encoding="utf-8") as f:
+                        f.write(ics_calendar(f"{name} timetable", rows, days, week_start))
+                    written.append(path)
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+
+    return written
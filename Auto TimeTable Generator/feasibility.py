@@ -0,0 +1,248 @@
+import argparse
+import os
+import sys
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import engine
+from engine import read_rows
+from slots import SlotGrid, load_grid, load_pins
+
+# Static necessary conditions checked before a GA run: counting/pigeonhole bounds per section and for
+# lab rooms, and a max-flow (bipartite matching) bound for teacher hours. Passing them does not prove
+# a timetable exists, failing any of them proves it does not.
+
+
+class Issue(NamedTuple):
+    check: str
+    message: str
+    rows: List[str]  # "file:line" of the input rows involved
+
+
+def lab_pair_capacity(grid: SlotGrid) -> int:
+    # Disjoint pairs of consecutive open slots in a week: floor(run / 2) per run of open periods
+    pairs = 0
+    for day in grid.days:
+        run = 0
+        for time in grid.times + [None]:
+            if time is not None and (day, time) not in grid.fixed:
+                run += 1
+            else:
+                pairs += run // 2
+                run = 0
+    return pairs
+
+
+def max_flow(capacity: Dict[str, Dict[str, float]], source: str, sink: str) -> Tuple[float, Set[str]]:
+    # Edmonds-Karp; also returns the nodes reachable from the source in the final residual graph
+    residual = {u: dict(edges) for u, edges in capacity.items()}
+    for u, edges in capacity.items():
+        for v in edges:
+            residual.setdefault(v, {}).setdefault(u, 0)
+    flow = 0
+
+    while True:
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            u = queue.popleft()
+            for v, c in residual[u].items():
+                if c > 0 and v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        if sink not in parent:
+            return flow, set(parent)
+
+        path, v = [], sink
+        while parent[v] is not None:
+            path.append((parent[v], v))
+            v = parent[v]
+        bottleneck = min(residual[u][v] for u, v in path)
+        for u, v in path:
+            residual[u][v] -= bottleneck
+            residual[v][u] += bottleneck
+        flow += bottleneck
+
+
+def analyze(data_dir: str = engine.DATA_DIR) -> List[Issue]:
+    # Uses the engine's reading of the data: every section takes every subject, and the last
+    # subjects.csv row of a subject sets its hours and teachers
+    rooms = read_rows(os.path.join(data_dir, "rooms.csv"))
+    sections = read_rows(os.path.join(data_dir, "sections.csv"))
+    subject_rows = read_rows(os.path.join(data_dir, "subjects.csv"))
+    issues = []
+
+    # Effective row per subject, keeping its line number (header is line 1)
+    subjects: Dict[str, Tuple[int, List[str], str]] = {}
+    for line, row in enumerate(subject_rows, start=2):
+        try:
+            hours = int(row["Hours"])
+        except (TypeError, ValueError):
+            issues.append(Issue("input", f"Hours {row['Hours']!r} is not a number", [f"subjects.csv:{line}"]))
+            continue
+        teachers = [t for t in (row["Teachers"] or "").split(",") if t]
+        if not teachers:
+            issues.append(Issue("input", f"{row['Subject']} lists no teachers", [f"subjects.csv:{line}"]))
+        subjects[row["Subject"]] = (hours, teachers, f"subjects.csv:{line}")
+
+    section_lines = {row["Section"]: f"sections.csv:{line}" for line, row in enumerate(sections, start=2)}
+    room_names = {row["Room"] for row in rooms}
+    for section, room in ((row["Section"], row["Room"]) for row in sections):
+        if room not in room_names:
+            issues.append(Issue("input", f"Section {section} uses room {room}, which is not in rooms.csv",
+                                [section_lines[section]]))
+    lab_rooms = [row["Room"] for row in rooms if row["Type"] == "Lab"]
+    labs = {s: v for s, v in subjects.items() if s.endswith("Lab")}
+    lectures = {s: v for s, v in subjects.items() if not s.endswith("Lab")}
+
+    grid = load_grid(data_dir)
+    days, fixed = grid.days, grid.fixed
+    open_slots = grid.slots - len(fixed)
+
+    # Pins: slots outside the grid, more pinned classes than a subject has hours, and a teacher or lab
+    # room pinned twice at once. Valid pins override the fixed slots of their section, as in
+    # engine.resolve_pins; a pin without a teacher takes the subject's first listed teacher.
+    pinned: Dict[str, Dict[Tuple[str, str], Tuple[str, str, str]]] = {}
+    busy: Dict[Tuple[str, str, str], List[str]] = {}
+    for line, (section, day, time, subject, teacher, room) in enumerate(load_pins(data_dir), start=2):
+        row = f"pins.csv:{line}"
+        if section not in section_lines or day not in grid.day_index or time not in grid.period:
+            issues.append(Issue("input", f"Pin {section} {day} {time} is not a section and slot of the grid", [row]))
+            continue
+        teacher = teacher or (subjects[subject][1][0] if subject in subjects and subjects[subject][1] else "N/A")
+        pinned.setdefault(section, {})[(day, time)] = (subject, teacher, row)
+        for resource in (teacher if teacher != "N/A" else None, room if subject.endswith("Lab") else None):
+            if resource:
+                busy.setdefault((resource, day, time), []).append(row)
+    for (resource, day, time), rows in busy.items():
+        if len(rows) > 1:
+            issues.append(Issue("pins", f"{resource} is pinned to {len(rows)} classes on {day} {time}", rows))
+
+    # Fixed and pinned classes of a subject in subjects.csv count towards its hours (as the engine's
+    # initializers do), so each section only has to place what they leave over in its open slots
+    def classes(section: Optional[str]) -> Dict[Tuple[str, str], Tuple[str, str, str]]:
+        slots = {slot: (subject, "N/A", "") for slot, subject in fixed.items()}
+        slots.update(pinned.get(section, {}))
+        return slots
+
+    def remaining(section: Optional[str]) -> Dict[str, int]:
+        covered: Dict[str, int] = {}
+        for subject, _, _ in classes(section).values():
+            covered[subject] = covered.get(subject, 0) + 1
+        return {subject: max(0, hours - covered.get(subject, 0)) for subject, (hours, _, _) in subjects.items()}
+
+    for section, slots in pinned.items():
+        for subject, (hours, _, line) in subjects.items():
+            rows = [row for name, _, row in slots.values() if name == subject]
+            if len(rows) > hours:
+                issues.append(Issue("pins", f"Section {section} has {len(rows)} pinned {subject} classes but "
+                                    f"{hours} hours", rows + [line]))
+
+    # Pigeonhole: a section's remaining hours against its open (non-fixed, unpinned) slots; sections
+    # without pins share the fixed-slots-only count
+    base = remaining(None)
+    demand = sum(base.values())
+    if demand > open_slots:
+        issues.append(Issue("section_hours",
+                            f"Each section needs {demand} hours but only {open_slots} slots are open "
+                            f"({len(days)} days x {len(grid.times)} periods minus {len(fixed)} fixed)",
+                            [line for _, _, line in subjects.values()]))
+    for section in pinned:
+        section_demand = sum(remaining(section).values())
+        section_open = grid.slots - len(classes(section))
+        if section_demand > section_open and not demand > open_slots:
+            issues.append(Issue("section_hours", f"Section {section} needs {section_demand} hours but its pins "
+                                f"leave {section_open} open slots",
+                                [section_lines[section]] + [row for _, _, row in pinned[section].values()]))
+
+    # A lecture subject can appear at most once per day
+    for subject, (hours, _, line) in lectures.items():
+        if hours > len(days):
+            issues.append(Issue("lecture_days", f"{subject} needs {hours} hours but may only be taught once a day "
+                                f"on {len(days)} days", [line]))
+
+    # Labs come in consecutive pairs, which have to fit in the runs of open periods
+    lab_pairs = sum(base[subject] // 2 for subject in labs)
+    if lab_pairs > lab_pair_capacity(grid):
+        issues.append(Issue("lab_pairs", f"Labs need {lab_pairs} double periods per section but the week has "
+                            f"room for {lab_pair_capacity(grid)}", [line for _, _, line in labs.values()]))
+
+    # No full day free: days without fixed slots each need a class
+    open_days = [day for day in days if not any((day, time) in fixed for time in grid.times)]
+    if demand < len(open_days):
+        issues.append(Issue("free_day", f"Each section has {demand} hours for {len(open_days)} days "
+                            f"without fixed classes ({', '.join(open_days)})",
+                            [line for _, _, line in subjects.values()]))
+
+    # Lab rooms: every lab hour of every section needs a lab room in an open slot
+    lab_hours = sum(hours for hours, _, _ in labs.values()) * len(sections)
+    if lab_hours and not lab_rooms:
+        issues.append(Issue("lab_rooms", "Lab subjects exist but rooms.csv has no Lab rooms",
+                            [line for _, _, line in labs.values()]))
+    elif lab_hours > len(lab_rooms) * open_slots:
+        issues.append(Issue("lab_rooms", f"{len(sections)} sections need {lab_hours} lab-room hours but "
+                            f"{len(lab_rooms)} lab rooms offer {len(lab_rooms) * open_slots}",
+                            [line for _, _, line in labs.values()]))
+
+    # Teachers: max flow from subjects (remaining hours over all sections) to eligible teachers (open slots
+    # each, less the classes pinned to them). Fixed slots are taught by "N/A" and charge nobody.
+    # A lab shares its lecture's teacher, so lab hours are charged to the lecture's pool as well.
+    pinned_hours: Dict[str, int] = {}
+    for slots in pinned.values():
+        for subject, teacher, _ in slots.values():
+            if teacher != "N/A":
+                pinned_hours[teacher] = pinned_hours.get(teacher, 0) + 1
+    left = {section: remaining(section) for section in section_lines}
+    capacity: Dict[str, Dict[str, float]] = {"source": {}}
+    course_rows: Dict[str, List[str]] = {}
+    for subject, (hours, teachers, line) in subjects.items():
+        course = subject.replace(" Lab", "")
+        node = f"subject:{course}"
+        capacity["source"][node] = capacity["source"].get(node, 0) + sum(counts[subject] for counts in left.values())
+        capacity.setdefault(node, {}).update({f"teacher:{t}": float("inf") for t in teachers})
+        course_rows.setdefault(course, []).append(line)
+        for teacher in teachers:
+            capacity.setdefault(f"teacher:{teacher}", {"sink": max(0, open_slots - pinned_hours.get(teacher, 0))})
+    total = sum(capacity["source"].values())
+    flow, reachable = max_flow(capacity, "source", "sink")
+    if flow < total:
+        # The source side of the minimum cut is a Hall violator: these subjects' teachers are saturated
+        short = sorted(node[len("subject:"):] for node in reachable if node.startswith("subject:"))
+        pool = sorted(node[len("teacher:"):] for node in reachable if node.startswith("teacher:"))
+        needed = sum(capacity["source"][f"subject:{s}"] for s in short)
+        available = sum(capacity[f"teacher:{t}"]["sink"] for t in pool)
+        issues.append(Issue("teacher_hours",
+                            f"{', '.join(short)} need {needed} teaching hours across {len(sections)} sections but "
+                            f"their {len(pool)} eligible teachers ({', '.join(pool)}) can give at most "
+                            f"{available}", sorted((line for s in short for line in course_rows[s]),
+                                                   key=lambda line: int(line.split(":")[1]))))
+
+    return issues
+
+
+def check(data_dir: str = engine.DATA_DIR):
+    # Raises before any GA work when the dataset cannot be scheduled
+    issues = analyze(data_dir)
+    if issues:
+        raise ValueError("Infeasible dataset:\n" + "\n".join(
+            f"- [{issue.check}] {issue.message} ({', '.join(issue.rows)})" for issue in issues))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check a timetable dataset for infeasibility before solving")
+    parser.add_argument("data_dirs", nargs="*", default=[engine.DATA_DIR])
+    args = parser.parse_args()
+
+    failures = 0
+    for data_dir in args.data_dirs:
+        issues = analyze(data_dir)
+        print(f"{data_dir}: {'infeasible' if issues else 'no infeasibility found'}")
+        for issue in issues:
+            print(f"  [{issue.check}] {issue.message}")
+            print(f"    rows: {', '.join(issue.rows)}")
+        failures += bool(issues)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
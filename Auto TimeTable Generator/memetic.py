@@ -0,0 +1,185 @@
+import random
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import engine
+from engine import Genome
+from seeding import resolve_rng
+
+# Local search budget per offspring
+MAX_STEPS = 30
+NEIGHBOURS = 12
+TABU_TENURE = 8
+
+Group = Tuple[str, str]  # (section, day)
+
+
+def day_penalty(genome: Genome, indices: List[int], section: str) -> int:
+    # calculate_fitness restricted to one section-day; the full fitness is the sum over groups
+    penalty = 0
+    entries = [genome[i] for i in indices]
+
+    subjects_today = [entry[3] for entry in entries if not entry[3].endswith("Lab") and entry[3] != "Free"]
+    if len(subjects_today) != len(set(subjects_today)):
+        penalty -= 10
+
+    daily_schedule = sorted(entries, key=lambda x: engine.GRID.period[x[1]])
+    for i in range(len(daily_schedule) - 1):
+        current = daily_schedule[i]
+        next_slot = daily_schedule[i + 1]
+        if current[3].endswith("Lab") and not engine.MODEL.is_pinned(current):
+            if not (next_slot[3] == current[3] and next_slot[5] == current[5]):
+                penalty -= 5
+
+    for entry in entries:
+        subject, room = entry[3], entry[5]
+        if engine.MODEL.is_pinned(entry):
+            continue
+        if subject.endswith("Lab") and room not in engine.LAB_ROOMS:
+            penalty -= 5
+        elif not subject.endswith("Lab") and room != engine.ROOMS[section]:
+            penalty -= 5
+
+    if all(entry[3] == "Free" for entry in entries):
+        penalty -= 10
+
+    return penalty
+
+
+class DeltaEvaluator:
+    # Keeps per-group penalties so a move is re-scored in O(slots per day)
+
+    def __init__(self, genome: Genome):
+        self.genome = list(genome)
+        self.groups: Dict[Group, List[int]] = {}
+        for index, (day, _, section, _, _, _) in enumerate(self.genome):
+            if section in engine.ROOMS and day in engine.DAYS:
+                self.groups.setdefault((section, day), []).append(index)
+        # Moves keep slots in place and only swap contents, so pinned slots stay pinned: they are
+        # masked out once and every move is drawn from the movable genes of its group
+        self.locked = {index for index, gene in enumerate(self.genome) if engine.MODEL.is_pinned(gene)}
+        self.movable = {group: [i for i in indices if i not in self.locked] for group, indices in self.groups.items()}
+        # Days with no genes at all still count as a free day
+        self.penalties = {group: day_penalty(self.genome, indices, group[0])
+                          for group, indices in self.groups.items()}
+        missing_days = len(engine.ROOMS) * len(engine.DAYS) - len(self.groups)
+        self.fitness = sum(self.penalties.values()) - 10 * missing_days
+        # Groups with any violation, kept up to date by apply() so moves can target them
+        self.conflicted = {group for group, penalty in self.penalties.items() if penalty < 0}
+
+    def group_of(self, index: int) -> Group:
+        return self.genome[index][2], self.genome[index][0]
+
+    def swap_delta(self, swaps: List[Tuple[int, int]]) -> int:
+        # Applies the content swaps, scores the touched groups and undoes them
+        self._swap(swaps)
+        groups = {self.group_of(i) for pair in swaps for i in pair}
+        delta = sum(day_penalty(self.genome, self.groups[group], group[0]) - self.penalties[group]
+                    for group in groups)
+        self._swap(list(reversed(swaps)))
+        return delta
+
+    def apply(self, swaps: List[Tuple[int, int]]):
+        self._swap(swaps)
+        for group in {self.group_of(i) for pair in swaps for i in pair}:
+            penalty = day_penalty(self.genome, self.groups[group], group[0])
+            self.fitness += penalty - self.penalties[group]
+            self.penalties[group] = penalty
+            if penalty < 0:
+                self.conflicted.add(group)
+            else:
+                self.conflicted.discard(group)
+
+    def _swap(self, swaps: List[Tuple[int, int]]):
+        # Exchange (subject, teacher, room) between two slots, the slots themselves stay put
+        for i, j in swaps:
+            a, b = self.genome[i], self.genome[j]
+            self.genome[i] = a[:3] + b[3:]
+            self.genome[j] = b[:3] + a[3:]
+
+
+def lab_partner(evaluator: DeltaEvaluator, index: int) -> int:
+    # Index of the slot right after a lab gene in the same group, or -1
+    day, time, section, subject, _, _ = evaluator.genome[index]
+    next_time = engine.GRID.next_time.get(time)
+    if not subject.endswith("Lab") or next_time is None:
+        return -1
+    for other in evaluator.groups[(section, day)]:
+        if evaluator.genome[other][1] == next_time:
+            return other
+    return -1
+
+
+def random_move(evaluator: DeltaEvaluator, rng: random.Random) -> List[Tuple[int, int]]:
+    # Moves start from a gene of a violated section-day first, like the GA's targeted mutation
+    if evaluator.conflicted and rng.random() < engine.CONFLICT_BIAS:
+        movable = evaluator.movable[rng.choice(tuple(evaluator.conflicted))]
+        if not movable:
+            return []
+        index = rng.choice(movable)
+    else:
+        index = rng.randrange(len(evaluator.genome))
+    section, day = evaluator.group_of(index)
+    if (section, day) not in evaluator.groups or index in evaluator.locked:
+        return []
+
+    partner = lab_partner(evaluator, index)
+    if partner >= 0 and partner not in evaluator.locked and rng.random() < 0.5:
+        # Move the lab pair onto two consecutive slots of another day of the same section
+        target_day = rng.choice(engine.DAYS)
+        targets = evaluator.groups.get((section, target_day), [])
+        by_time = {evaluator.genome[i][1]: i for i in targets}
+        time = engine.TIMES[rng.randrange(len(engine.TIMES) - 1)]
+        first, second = by_time.get(time), by_time.get(engine.GRID.next_time[time])
+        if first is None or second is None or {first, second} & {index, partner} or \
+                first in evaluator.locked or second in evaluator.locked:
+            return []
+        return [(index, first), (partner, second)]
+
+    # Swap two slots of the same section-day
+    other = rng.choice(evaluator.movable[(section, day)])
+    return [(index, other)] if other != index else []
+
+
+def local_search(genome: Genome, max_steps: int = MAX_STEPS, neighbours: int = NEIGHBOURS,
+                 tabu_tenure: int = TABU_TENURE, rng: Optional[random.Random] = None,
+                 max_evaluations: Optional[int] = None) -> Tuple[Genome, int, int]:
+    # Tabu search over slot swaps and lab-pair moves; returns the best genome, its fitness and the
+    # evaluations spent: the initial scoring and one per scored neighbour, at most max_evaluations
+    rng = resolve_rng(rng)
+    evaluator = DeltaEvaluator(genome)
+    evaluations = 1
+    best_genome, best_fitness = list(evaluator.genome), evaluator.fitness
+    tabu = deque(maxlen=tabu_tenure)
+
+    for _ in range(max_steps):
+        best_move, best_delta = None, None
+        for _ in range(neighbours):
+            if max_evaluations is not None and evaluations >= max_evaluations:
+                break
+            move = random_move(evaluator, rng)
+            if not move:
+                continue
+            delta = evaluator.swap_delta(move)
+            evaluations += 1
+            key = frozenset(i for pair in move for i in pair)
+            # Aspiration: a tabu move is still taken if it beats the best genome so far
+            if key in tabu and evaluator.fitness + delta <= best_fitness:
+                continue
+            if best_delta is None or delta > best_delta:
+                best_move, best_delta = move, delta
+
+        if best_move is None:
+            continue
+        evaluator.apply(best_move)
+        tabu.append(frozenset(i for pair in best_move for i in pair))
+        if evaluator.fitness > best_fitness:
+            best_genome, best_fitness = list(evaluator.genome), evaluator.fitness
+        if best_fitness >= 0 or (max_evaluations is not None and evaluations >= max_evaluations):
+            break
+
+    return best_genome, best_fitness, evaluations
+
+
+def memetic_algorithm(**kwargs) -> Tuple[Genome, str]:
+    return engine.genetic_algorithm(improve=local_search, **kwargs)
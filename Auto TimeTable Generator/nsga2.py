@@ -0,0 +1,169 @@
+import random
+from typing import Dict, List, Optional, Tuple
+
+import engine
+from engine import Genome
+from seeding import make_rng
+
+# Parameters
+POPULATION_SIZE = 20
+GENERATIONS = 50
+
+# All objectives are minimized; hard-constraint violations are handled by
+# constrained domination (feasible genomes always beat infeasible ones)
+OBJECTIVES = ["teacher_load_spread", "student_idle_gaps", "lab_rooms_used"]
+
+Objectives = Tuple[float, ...]
+
+
+def evaluate(genome: Genome) -> Tuple[int, Objectives]:
+    violations = -engine.calculate_fitness(genome)
+
+    teacher_hours: Dict[str, int] = {}
+    lab_rooms = set()
+    section_days: Dict[Tuple[str, str], List[int]] = {}
+    for day, time, section, subject, teacher, room in genome:
+        if subject == "Free":
+            continue
+        if teacher != "N/A":
+            teacher_hours[teacher] = teacher_hours.get(teacher, 0) + 1
+        if subject.endswith("Lab"):
+            lab_rooms.add(room)
+        section_days.setdefault((section, day), []).append(engine.GRID.period[time])
+
+    # Teacher load balance: spread between the busiest and the least busy teacher
+    load_spread = max(teacher_hours.values()) - min(teacher_hours.values()) if teacher_hours else 0
+    # Student idle gaps: free periods between a section's first and last class of the day
+    idle_gaps = sum(max(slots) - min(slots) + 1 - len(set(slots)) for slots in section_days.values())
+
+    return violations, (load_spread, idle_gaps, len(lab_rooms))
+
+
+def dominates(a: Tuple[int, Objectives], b: Tuple[int, Objectives]) -> bool:
+    (violations_a, objectives_a), (violations_b, objectives_b) = a, b
+    if violations_a != violations_b:
+        return violations_a < violations_b
+    return (all(x <= y for x, y in zip(objectives_a, objectives_b)) and
+            any(x < y for x, y in zip(objectives_a, objectives_b)))
+
+
+def fast_non_dominated_sort(scores: List[Tuple[int, Objectives]]) -> List[List[int]]:
+    # Deb et al.: O(M N^2) comparisons, each front is peeled off via domination counts
+    dominated_by: List[List[int]] = [[] for _ in scores]
+    domination_count = [0] * len(scores)
+
+    for p in range(len(scores)):
+        for q in range(p + 1, len(scores)):
+            if dominates(scores[p], scores[q]):
+                dominated_by[p].append(q)
+                domination_count[q] += 1
+            elif dominates(scores[q], scores[p]):
+                dominated_by[q].append(p)
+                domination_count[p] += 1
+
+    fronts = [[p for p in range(len(scores)) if domination_count[p] == 0]]
+
+    while fronts[-1]:
+        next_front = []
+        for p in fronts[-1]:
+            for q in dominated_by[p]:
+                domination_count[q] -= 1
+                if domination_count[q] == 0:
+                    next_front.append(q)
+        fronts.append(next_front)
+    return fronts[:-1]
+
+
+def crowding_distance(scores: List[Tuple[int, Objectives]], front: List[int]) -> Dict[int, float]:
+    # O(M N log N): one sort per objective
+    distance = {i: 0.0 for i in front}
+    for m in range(len(OBJECTIVES)):
+        ordered = sorted(front, key=lambda i: scores[i][1][m])
+        low, high = scores[ordered[0]][1][m], scores[ordered[-1]][1][m]
+        distance[ordered[0]] = distance[ordered[-1]] = float("inf")
+        if high == low:
+            continue
+        for k in range(1, len(ordered) - 1):
+            distance[ordered[k]] += (scores[ordered[k + 1]][1][m] - scores[ordered[k - 1]][1][m]) / (high - low)
+    return distance
+
+
+def rank_population(scores: List[Tuple[int, Objectives]]) -> Tuple[Dict[int, int], Dict[int, float], List[List[int]]]:
+    fronts = fast_non_dominated_sort(scores)
+    rank, distance = {}, {}
+    for level, front in enumerate(fronts):
+        distance.update(crowding_distance(scores, front))
+        for i in front:
+            rank[i] = level
+    return rank, distance, fronts
+
+
+def tournament(rank: Dict[int, int], distance: Dict[int, float], size: int, rng: random.Random) -> int:
+    a, b = rng.randrange(size), rng.randrange(size)
+    if rank[a] != rank[b]:
+        return a if rank[a] < rank[b] else b
+    return a if distance[a] >= distance[b] else b
+
+
+def nsga2(population_size: int = POPULATION_SIZE, generations: int = GENERATIONS,
+          seed: Optional[int] = None) -> List[Tuple[Genome, Dict]]:
+    rng = make_rng(seed)
+    population = [engine.construct_genome(rng=rng) for _ in range(population_size)]
+    scores = [evaluate(genome) for genome in population]
+
+    for _ in range(generations):
+        rank, distance, _ = rank_population(scores)
+        offspring = []
+        while len(offspring) < population_size:
+            parent1 = population[tournament(rank, distance, len(population), rng)]
+            parent2 = population[tournament(rank, distance, len(population), rng)]
+            child1, child2 = engine.crossover(parent1, parent2, rng)
+            offspring += [engine.mutate(child1, rng), engine.mutate(child2, rng)]
+
+        # Elitist (mu + lambda) survival by front, ties in the last front broken by crowding
+        combined = population + offspring
+        combined_scores = scores + [evaluate(genome) for genome in offspring]
+        _, distance, fronts = rank_population(combined_scores)
+        survivors = []
+        for front in fronts:
+            if len(survivors) + len(front) <= population_size:
+                survivors += front
+            else:
+                front = sorted(front, key=lambda i: distance[i], reverse=True)
+                survivors += front[:population_size - len(survivors)]
+                break
+        population = [combined[i] for i in survivors]
+        scores = [combined_scores[i] for i in survivors]
+
+    # Pareto set: first front, de-duplicated by objective vector
+    _, _, fronts = rank_population(scores)
+    pareto, seen = [], set()
+    for i in fronts[0]:
+        if scores[i] in seen:
+            continue
+        seen.add(scores[i])
+        pareto.append((population[i], dict(zip(["violations"] + OBJECTIVES, (scores[i][0],) + scores[i][1]))))
+    return sorted(pareto, key=lambda x: tuple(x[1].values()))
+
+
+def main():
+    # The UI stack is only needed here: nsga2() itself imports as light as the engine
+    import pandas as pd
+    import streamlit as st
+
+    import algo_v9
+
+    st.title("Timetable Trade-offs")
+    if "pareto" not in st.session_state:
+        with st.spinner("Running multi-objective search..."):
+            st.session_state["pareto"] = nsga2()
+    pareto = st.session_state["pareto"]
+
+    st.dataframe(pd.DataFrame([objectives for _, objectives in pareto]))
+    choice = st.selectbox("Solution", range(len(pareto)),
+                          format_func=lambda i: ", ".join(f"{k} {v}" for k, v in pareto[i][1].items()))
+    algo_v9.display_timetable(pareto[choice][0], key=f"pareto-{choice}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from slots import Slot, SlotGrid
+
+# Rejection-sampling tries before falling back to an explicit candidate scan
+SAMPLE_TRIES = 8
+
+# section -> (day, time) -> (subject, teacher, room) of every pinned gene
+Pins = Dict[str, Dict[Slot, Tuple[str, str, str]]]
+
+
+class ProblemModel:
+    # Indexed view of the dataset: a boolean subject x teacher matrix plus per-subject
+    # teacher bitmasks, so candidate filtering is bit arithmetic instead of list scans
+
+    def __init__(self, sections: Sequence[str], subjects: Sequence[str], teachers: Dict[str, List[str]],
+                 grid: SlotGrid, pins: Pins):
+        self.sections = list(sections)
+        self.section_index = {section: i for i, section in enumerate(self.sections)}
+        # Pinned-only subjects (English, Second Language, ...) are indexed after the dataset subjects
+        pinned = [gene for slots in pins.values() for gene in slots.values()]
+        self.subjects = list(subjects) + list(dict.fromkeys(s for s, _, _ in pinned if s not in subjects))
+        self.subject_index = {subject: i for i, subject in enumerate(self.subjects)}
+        self.teachers = sorted({t for subject in subjects for t in teachers[subject]} |
+                               {t for _, t, _ in pinned if t != "N/A"})
+        self.teacher_index = {teacher: i for i, teacher in enumerate(self.teachers)}
+        self.days, self.times = grid.days, grid.times
+        self.slots_per_section = grid.slots
+
+        self.subject_teacher = np.zeros((len(self.subjects), len(self.teachers)), dtype=bool)
+        for subject in subjects:
+            for teacher in teachers[subject]:
+                self.subject_teacher[self.subject_index[subject], self.teacher_index[teacher]] = True
+
+        # Pinned genes and their mask over the canonical (section, day, time) layout; operators draw
+        # positions from the unlocked list, so pinned genes are never part of the search
+        self.pins = {section: dict(pins.get(section, {})) for section in self.sections}
+        self.locked = np.zeros((len(self.sections), len(self.days), len(self.times)), dtype=bool)
+        for section, slots in self.pins.items():
+            for day, time in slots:
+                self.locked[self.section_index[section], grid.day_index[day], grid.period[time]] = True
+        self.unlocked = np.flatnonzero(~self.locked.ravel()).tolist()
+
+        # Per-subject teacher bitmask and candidate list derived from the matrix
+        self.teacher_bits = [sum(1 << int(j) for j in np.flatnonzero(row)) for row in self.subject_teacher]
+        self.candidates = [[self.teachers[j] for j in np.flatnonzero(row)] for row in self.subject_teacher]
+
+    def teacher_bit(self, teacher: str) -> int:
+        return 1 << self.teacher_index[teacher] if teacher in self.teacher_index else 0
+
+    def sample_teacher(self, subject: str, in_use: int, rng: random.Random) -> str:
+        # Uniform over eligible teachers not in the in-use bitset, any eligible teacher if all are busy
+        s = self.subject_index[subject]
+        candidates = self.candidates[s]
+        if not self.teacher_bits[s] & ~in_use:
+            return rng.choice(candidates)
+        for _ in range(SAMPLE_TRIES):
+            teacher = rng.choice(candidates)
+            if not in_use >> self.teacher_index[teacher] & 1:
+                return teacher
+        return rng.choice([t for t in candidates if not in_use >> self.teacher_index[t] & 1])
+
+    def section_bounds(self, genome: Sequence[Tuple[str, ...]], section: str) -> Tuple[int, int]:
+        # Canonical genomes hold each section as one contiguous block; otherwise scan everything
+        start = self.section_index[section] * self.slots_per_section
+        end = start + self.slots_per_section
+        if len(genome) == len(self.sections) * self.slots_per_section and \
+                genome[start][2] == section and genome[end - 1][2] == section:
+            return start, end
+        return 0, len(genome)
+
+    def section_teacher_bits(self, genome: Sequence[Tuple[str, ...]], section: str) -> int:
+        start, end = self.section_bounds(genome, section)
+        bits = 0
+        for i in range(start, end):
+            if genome[i][2] == section:
+                bits |= self.teacher_bit(genome[i][4])
+        return bits
+
+    def is_pinned(self, gene: Tuple[str, ...]) -> bool:
+        return (gene[0], gene[1]) in self.pins.get(gene[2], ())
+
+    def unlocked_index(self, genome: Sequence[Tuple[str, ...]], rng: random.Random) -> int:
+        # Uniform over the unpinned genes of a canonical genome; other layouts fall back to a scan.
+        # -1 when every gene is pinned.
+        if len(genome) == len(self.sections) * self.slots_per_section and self.unlocked:
+            index = rng.choice(self.unlocked)
+            if not self.is_pinned(genome[index]):
+                return index
+        free = [i for i, gene in enumerate(genome) if not self.is_pinned(gene)]
+        return rng.choice(free) if free else -1
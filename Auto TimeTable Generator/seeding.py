@@ -0,0 +1,31 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+
+# Every stochastic function takes an optional rng; None falls back to the
+# shared module-level generator so existing random.seed() calls keep working.
+
+
+def resolve_rng(rng: Optional[random.Random]) -> random.Random:
+    # The random module exposes its shared generator's methods, so it stands in for an instance
+    return rng if rng is not None else random
+
+
+def make_rng(seed: Optional[int] = None) -> random.Random:
+    return random.Random(seed)
+
+
+def spawn_seeds(seed: int, count: int) -> List[int]:
+    # Independent child seeds (SeedSequence spawning), stable for a given parent seed
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
+
+
+def spawn_rngs(seed: int, count: int) -> List[random.Random]:
+    # One stream per worker or island; streams never share state
+    return [random.Random(child) for child in spawn_seeds(seed, count)]
+
+
+def numpy_rng(seed: Optional[int] = None) -> np.random.Generator:
+    # Vectorized stream for batch operators
+    return np.random.default_rng(np.random.SeedSequence(seed))
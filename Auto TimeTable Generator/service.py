@@ -0,0 +1,246 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Manager
+from typing import Dict, Optional
+
+import engine
+from feasibility import check
+from telemetry import GenerationStats
+
+# Parameters
+HOST = "127.0.0.1"
+PORT = 8502
+WORKERS = max(1, (os.cpu_count() or 2) // 2)
+MAX_PENDING = 32          # queued + running jobs before new work is refused
+CACHE_SIZE = 256          # finished jobs kept for polling and deduplication
+
+DATASET_FILES = ["rooms", "subjects", "sections"]
+OPTIONAL_FILES = ["slots", "pins"]  # default week and no pins when absent
+# GA parameters of a job request: name -> (default, type, may be null, smallest value)
+PARAMETERS = {
+    "seed": (0, int, False, None),
+    "generations": (engine.GENERATIONS, int, False, 0),
+    "population_size": (engine.POPULATION_SIZE, int, False, 1),
+    "patience": (engine.PATIENCE, int, True, 0),
+    "time_limit": (engine.TIME_LIMIT, float, True, 0),
+    "max_evaluations": (engine.MAX_EVALUATIONS, int, True, 1),
+    "memetic": (False, bool, False, None),
+}
+
+
+def dataset_error(name: str, value) -> Optional[str]:
+    # CSV files travel as text; optional ones may be left out, null or empty
+    if value is None:
+        return None if name in OPTIONAL_FILES else f"{name} CSV text is missing"
+    if not isinstance(value, str):
+        return f"{name} must be CSV text"
+    return None
+
+
+def parameter_error(name: str, value) -> Optional[str]:
+    _, kind, nullable, minimum = PARAMETERS[name]
+    if value is None:
+        return None if nullable else f"{name} must not be null"
+    # bool is a subclass of int: JSON true/false is not a number, and a number is not a flag
+    expected = (int, float) if kind is float else kind
+    if isinstance(value, bool) != (kind is bool) or not isinstance(value, expected):
+        return f"{name} must be {'a boolean' if kind is bool else 'a number' if kind is float else 'an integer'}"
+    if minimum is not None and value < minimum:
+        return f"{name} must be at least {minimum}"
+    return None
+
+
+def run_job(job_id: str, request: Dict, progress) -> Dict:
+    # Executed in a pool process; progress is a Manager dict shared with the server
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name in DATASET_FILES + [name for name in OPTIONAL_FILES if request.get(name)]:
+            with open(os.path.join(data_dir, f"{name}.csv"), "w") as f:
+                f.write(request[name])
+        # An infeasible dataset fails the job with the analyzer's explanation as its error
+        check(data_dir)
+        engine.load_data(data_dir)
+
+    def report(stats: GenerationStats):
+        progress[job_id] = {"generation": stats.generation + 1, "generations": request["generations"],
+                            "best_fitness": stats.best_fitness}
+
+    best, stop_reason = engine.run(memetic=request["memetic"], generations=request["generations"],
+                                   population_size=request["population_size"], patience=request["patience"],
+                                   time_limit=request["time_limit"], max_evaluations=request["max_evaluations"],
+                                   on_generation=report, seed=request["seed"])
+    return {
+        "fitness": engine.calculate_fitness(best),
+        "stop_reason": stop_reason,
+        "timetable": [dict(zip(["day", "time", "section", "subject", "teacher", "room"], gene)) for gene in best],
+    }
+
+
+class JobQueue:
+    def __init__(self, workers: int = WORKERS, max_pending: int = MAX_PENDING, cache_size: int = CACHE_SIZE):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.manager = Manager()
+        self.progress = self.manager.dict()
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.by_key: Dict[str, str] = {}
+
+    @staticmethod
+    def request_key(request: Dict) -> str:
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def submit(self, request: Dict) -> Optional[Dict]:
+        key = self.request_key(request)
+        with self.lock:
+            # Identical dataset and parameters: hand back the existing job instead of rerunning the GA
+            if key in self.by_key:
+                job = self.jobs[self.by_key[key]]
+                failed = job["future"].done() and job["future"].exception() is not None
+                if not failed:
+                    self.jobs.move_to_end(job["id"])
+                    return job
+                # Failed runs are retried rather than served from the cache
+                del self.jobs[job["id"]]
+            if sum(1 for job in self.jobs.values() if not job["future"].done()) >= self.max_pending:
+                return None
+
+            job_id = uuid.uuid4().hex
+            job = {"id": job_id, "key": key, "future": self.executor.submit(run_job, job_id, request, self.progress)}
+            self.jobs[job_id] = job
+            self.by_key[key] = job_id
+            self.evict()
+            return job
+
+    def evict(self):
+        # Drop the least recently used finished jobs beyond the cache size
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.cache_size:
+                break
+            job = self.jobs[job_id]
+            if job["future"].done():
+                del self.jobs[job_id]
+                del self.by_key[job["key"]]
+                self.progress.pop(job_id, None)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        future = job["future"]
+        if future.running():
+            state = "running"
+        elif not future.done():
+            state = "queued"
+        elif future.exception() is not None:
+            state = "failed"
+        else:
+            state = "done"
+        status = {"id": job_id, "status": state, "progress": self.progress.get(job_id)}
+        if state == "failed":
+            status["error"] = str(future.exception())
+        return status
+
+    def result(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None or not job["future"].done() or job["future"].exception() is not None:
+            return None
+        return job["future"].result()
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+        self.manager.shutdown()
+
+
+class SchedulingHandler(BaseHTTPRequestHandler):
+    queue: JobQueue = None
+
+    def send_json(self, code: int, body: Dict):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self.send_json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            self.send_json(400, {"error": f"expected a JSON object with {', '.join(DATASET_FILES)} CSV text"})
+            return
+
+        # Every field is checked before queueing, so a bad request gets a 400 instead of a failed job
+        request = {}
+        for name in DATASET_FILES + OPTIONAL_FILES:
+            error = dataset_error(name, body.get(name))
+            if error:
+                self.send_json(400, {"error": error})
+                return
+            if body.get(name):
+                request[name] = body[name]
+        for name, (default, _, _, _) in PARAMETERS.items():
+            request[name] = body.get(name, default)
+            error = parameter_error(name, request[name])
+            if error:
+                self.send_json(400, {"error": error})
+                return
+
+        job = self.queue.submit(request)
+        if job is None:
+            self.send_json(503, {"error": "too many pending jobs"})
+            return
+        self.send_json(202, self.queue.status(job["id"]))
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("/") if part]
+        if len(parts) == 2 and parts[0] == "jobs":
+            status = self.queue.status(parts[1])
+            self.send_json(200 if status else 404, status or {"error": "unknown job"})
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            result = self.queue.result(parts[1])
+            if result is None:
+                status = self.queue.status(parts[1])
+                self.send_json(404 if status is None else 409, status or {"error": "unknown job"})
+            else:
+                self.send_json(200, result)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP service queueing timetable GA runs")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    SchedulingHandler.queue = JobQueue(workers=args.workers)
+    server = ThreadingHTTPServer((args.host, args.port), SchedulingHandler)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        SchedulingHandler.queue.shutdown()
+
+
+if __name__ == "__main__":
+    main()
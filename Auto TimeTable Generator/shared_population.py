@@ -0,0 +1,104 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from batch import GenomeCodec, batch_fitness
+
+# Parameters
+WORKERS = os.cpu_count() or 1
+BUFFERS = 2  # current and next generation, swapped by index
+
+
+class SharedPopulation:
+    # Population store in shared memory: a (buffers, population, genome length, 3) int32 genome
+    # tensor and a (buffers, population) float64 fitness vector. Workers attach by name, so a
+    # task only carries a buffer index and a slice.
+
+    def __init__(self, genome_shape: Tuple[int, ...], fitness_shape: Tuple[int, ...],
+                 names: Optional[Dict[str, str]] = None):
+        self.owner = names is None
+        self.blocks = {}
+        self.genomes = self._array("genomes", genome_shape, np.int32, names)
+        self.fitness = self._array("fitness", fitness_shape, np.float64, names)
+
+    @classmethod
+    def create(cls, codec: GenomeCodec, population_size: int, buffers: int = BUFFERS) -> "SharedPopulation":
+        return cls((buffers, population_size, codec.length, 3), (buffers, population_size))
+
+    def _array(self, key: str, shape: Tuple[int, ...], dtype, names: Optional[Dict[str, str]]) -> np.ndarray:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if names is None:
+            block = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Pool workers share the creator's resource tracker, so attaching adds no second owner
+            block = shared_memory.SharedMemory(name=names[key])
+        self.blocks[key] = block
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    def spec(self) -> Dict:
+        # Everything a worker needs to attach: block names and shapes, no data
+        return {"names": {key: block.name for key, block in self.blocks.items()},
+                "genome_shape": self.genomes.shape, "fitness_shape": self.fitness.shape}
+
+    @classmethod
+    def attach(cls, spec: Dict) -> "SharedPopulation":
+        return cls(spec["genome_shape"], spec["fitness_shape"], spec["names"])
+
+    def close(self):
+        # Views must go before the mappings can be closed
+        del self.genomes, self.fitness
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Worker-process state, set once by the pool initializer
+_codec: Optional[GenomeCodec] = None
+_store: Optional[SharedPopulation] = None
+
+
+def _init_worker(codec: GenomeCodec, spec: Dict):
+    global _codec, _store
+    _codec, _store = codec, SharedPopulation.attach(spec)
+
+
+def _evaluate_slice(buffer: int, start: int, stop: int):
+    # Scores genomes[buffer, start:stop] in place; nothing but the indices is pickled
+    _store.fitness[buffer, start:stop] = batch_fitness(_codec, _store.genomes[buffer, start:stop])
+
+
+class ParallelEvaluator:
+    # Splits a buffer into one contiguous slice per worker and scores the slices in parallel
+
+    def __init__(self, codec: GenomeCodec, store: SharedPopulation, workers: int = WORKERS):
+        population_size = store.genomes.shape[1]
+        self.workers = max(1, min(workers, population_size))
+        bounds = np.linspace(0, population_size, self.workers + 1).astype(int)
+        self.slices: List[Tuple[int, int]] = [(int(a), int(b)) for a, b in zip(bounds, bounds[1:]) if b > a]
+        # The codec is pickled once per worker, at start-up
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(codec, store.spec()))
+
+    def evaluate(self, buffer: int):
+        futures = [self.executor.submit(_evaluate_slice, buffer, start, stop) for start, stop in self.slices]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
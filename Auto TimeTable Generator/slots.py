@@ -0,0 +1,84 @@
+import csv
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Default week, used when a dataset has no slots.csv
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+TIMES = ["9:00-9:50", "10:00-10:50", "11:00-11:50",
+         "12:00-12:50", "1:40-2:30", "2:40-3:30", "3:40-4:30"]
+
+# Fixed slots for second languages and English
+FIXED_SLOTS = {
+    ("Tuesday", "11:00-11:50"): "Second Language",
+    ("Wednesday", "9:00-9:50"): "Second Language",
+    ("Thursday", "10:00-10:50"): "Second Language",
+    ("Monday", "10:00-10:50"): "English",
+    ("Wednesday", "10:00-10:50"): "English",
+    ("Thursday", "11:00-11:50"): "English",
+}
+
+Slot = Tuple[str, str]  # (day, time)
+# Pinned assignment: (section, day, time, subject, teacher, room); teacher and room may be None
+Pin = Tuple[str, str, str, str, Optional[str], Optional[str]]
+
+
+class SlotGrid:
+    # Days x periods of one dataset and its fixed slots. Every day has the same periods, so genomes
+    # stay a (section, day, period) grid; day/period positions and the next period are precomputed
+    # once so that callers do dict lookups instead of list.index scans.
+
+    def __init__(self, days: Iterable[str], times: Iterable[str], fixed: Dict[Slot, str]):
+        self.days, self.times = list(days), list(times)
+        self.fixed = dict(fixed)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.period = {time: i for i, time in enumerate(self.times)}
+        self.slots = len(self.days) * len(self.times)
+
+        # Slot adjacency: the period right after each period on the same day, None after the last
+        self.next_time: Dict[str, Optional[str]] = dict(zip(self.times, self.times[1:] + [None]))
+
+        for day, time in self.fixed:
+            if day not in self.day_index or time not in self.period:
+                raise ValueError(f"Fixed slot {day} {time} is not in the slot grid")
+
+
+def default_grid() -> SlotGrid:
+    return SlotGrid(DAYS, TIMES, FIXED_SLOTS)
+
+
+def load_grid(data_dir: str) -> SlotGrid:
+    # slots.csv lists every slot as Day,Time with an optional Fixed subject. An optional Week
+    # column (A, B, ...) makes a rotating timetable: its days are labelled "A Monday", "B Monday", ...
+    path = os.path.join(data_dir, "slots.csv")
+    if not os.path.exists(path):
+        return default_grid()
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError(f"{path} has no slots")
+
+    periods: Dict[str, List[str]] = {}
+    fixed = {}
+    for row in rows:
+        day = f"{row['Week']} {row['Day']}" if row.get("Week") else row["Day"]
+        periods.setdefault(day, []).append(row["Time"])
+        if row.get("Fixed"):
+            fixed[(day, row["Time"])] = row["Fixed"]
+
+    days = list(periods)
+    times = periods[days[0]]
+    for day in days[1:]:
+        if periods[day] != times:
+            raise ValueError(f"{path}: {day} has periods {periods[day]}, expected {times} like {days[0]}")
+    return SlotGrid(days, times, fixed)
+
+
+def load_pins(data_dir: str) -> List[Pin]:
+    # pins.csv locks single assignments: Section,Day,Time,Subject with optional Teacher and Room
+    # columns (blank means the section's usual choice, see engine.bind_data)
+    path = os.path.join(data_dir, "pins.csv")
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        return [(row["Section"], row["Day"], row["Time"], row["Subject"], row.get("Teacher") or None,
+                 row.get("Room") or None) for row in csv.DictReader(f)]
@@ -0,0 +1,201 @@
+import argparse
+import os
+import sqlite3
+import time
+from typing import List, Optional
+
+import engine
+from engine import Genome, read_rows
+
+# Parameters
+DB_PATH = "timetable.db"
+SCHEMA_VERSION = 1  # 1: sections and subjects keyed by department, so departments may reuse section names
+
+# Teachers are stored once and linked to subjects through eligibility, so nothing is re-split on load;
+# the keys and indexes cover the per-department slice (sections -> subjects -> eligibility -> teachers)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rooms (
+    room TEXT PRIMARY KEY,
+    type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    department TEXT NOT NULL,
+    section TEXT NOT NULL,
+    room TEXT NOT NULL REFERENCES rooms(room),
+    PRIMARY KEY (department, section)
+);
+CREATE TABLE IF NOT EXISTS subjects (
+    id INTEGER PRIMARY KEY,
+    department TEXT NOT NULL,
+    section TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    hours INTEGER NOT NULL,
+    UNIQUE (department, section, subject),
+    FOREIGN KEY (department, section) REFERENCES sections(department, section)
+);
+CREATE TABLE IF NOT EXISTS teachers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS eligibility (
+    subject_id INTEGER NOT NULL REFERENCES subjects(id),
+    teacher_id INTEGER NOT NULL REFERENCES teachers(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (subject_id, teacher_id)
+);
+CREATE INDEX IF NOT EXISTS eligibility_teacher ON eligibility(teacher_id);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    department TEXT,
+    seed INTEGER,
+    fitness INTEGER NOT NULL,
+    stop_reason TEXT,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    day TEXT NOT NULL,
+    time TEXT NOT NULL,
+    section TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    teacher TEXT NOT NULL,
+    room TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assignments_run ON assignments(run_id, section);
+"""
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    version, = connection.execute("PRAGMA user_version").fetchone()
+    if version < SCHEMA_VERSION and connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sections'").fetchone():
+        connection.close()
+        raise ValueError(f"{db_path} uses an older store layout; import the datasets into a new database")
+    connection.executescript(SCHEMA)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return connection
+
+
+def import_csv(connection: sqlite3.Connection, data_dir: str, department: Optional[str] = None) -> int:
+    # One transaction per dataset. sections.csv may carry a Department column; otherwise every
+    # section goes to the given department, by default the dataset directory's name. A dataset
+    # replaces what its departments held before: their sections, subjects and eligibility rows are
+    # dropped first, while other departments (which may use the same section names) are left alone.
+    # Rooms and teachers are shared between departments and only added or updated.
+    department = department or os.path.basename(os.path.normpath(os.path.abspath(data_dir)))
+    rooms = read_rows(os.path.join(data_dir, "rooms.csv"))
+    sections = read_rows(os.path.join(data_dir, "sections.csv"))
+    subjects = read_rows(os.path.join(data_dir, "subjects.csv"))
+    imported = sorted({row.get("Department") or department for row in sections})
+
+    with connection:
+        stale = [(name,) for name in imported]
+        connection.executemany("DELETE FROM eligibility WHERE subject_id IN "
+                               "(SELECT id FROM subjects WHERE department = ?)", stale)
+        connection.executemany("DELETE FROM subjects WHERE department = ?", stale)
+        connection.executemany("DELETE FROM sections WHERE department = ?", stale)
+
+        connection.executemany("INSERT OR REPLACE INTO rooms (room, type) VALUES (?, ?)",
+                               [(row["Room"], row["Type"]) for row in rooms])
+        section_department = {row["Section"]: row.get("Department") or department for row in sections}
+        connection.executemany("INSERT INTO sections (department, section, room) VALUES (?, ?, ?)",
+                               [(section_department[row["Section"]], row["Section"], row["Room"])
+                                for row in sections])
+        names = {teacher for row in subjects for teacher in row["Teachers"].split(",")}
+        connection.executemany("INSERT OR IGNORE INTO teachers (name) VALUES (?)", [(name,) for name in names])
+        teacher_ids = dict(connection.execute("SELECT name, id FROM teachers"))
+
+        for row in subjects:
+            subject_id = connection.execute(
+                "INSERT INTO subjects (department, section, subject, hours) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (department, section, subject) DO UPDATE SET hours = excluded.hours RETURNING id",
+                (section_department.get(row["Section"], department), row["Section"], row["Subject"],
+                 int(row["Hours"]))).fetchone()[0]
+            # A repeated (section, subject) row replaces the earlier one, as it does in engine.load_data
+            connection.execute("DELETE FROM eligibility WHERE subject_id = ?", (subject_id,))
+            connection.executemany("INSERT INTO eligibility (subject_id, teacher_id, position) VALUES (?, ?, ?)",
+                                   [(subject_id, teacher_ids[teacher], position)
+                                    for position, teacher in enumerate(row["Teachers"].split(","))])
+    return len(sections)
+
+
+def departments(connection: sqlite3.Connection) -> List[str]:
+    return [department for department, in connection.execute("SELECT DISTINCT department FROM sections ORDER BY 1")]
+
+
+def load_department(connection: sqlite3.Connection, department: Optional[str] = None):
+    # Binds one department (or everything, with None) into the engine globals through the keys.
+    # Departments may reuse section names, so with None every section is named "department/section"
+    where, parameters = ("WHERE s.department = ?", (department,)) if department is not None else ("", ())
+    name = "s.section" if department is not None else "s.department || '/' || s.section"
+    sections = connection.execute(f"SELECT {name}, s.room FROM sections s {where} ORDER BY s.rowid",
+                                  parameters).fetchall()
+    if not sections:
+        raise ValueError(f"No sections for department {department!r}")
+
+    subjects = {}
+    for subject_id, subject, hours, teacher in connection.execute(
+            f"SELECT j.id, j.subject, j.hours, t.name FROM sections s "
+            f"JOIN subjects j ON j.department = s.department AND j.section = s.section "
+            f"JOIN eligibility e ON e.subject_id = j.id "
+            f"JOIN teachers t ON t.id = e.teacher_id {where} ORDER BY j.id, e.position", parameters):
+        subjects.setdefault(subject_id, (subject, hours, []))[2].append(teacher)
+    lab_rooms = [room for room, in connection.execute("SELECT room FROM rooms WHERE type = 'Lab' ORDER BY rowid")]
+
+    engine.bind_data(dict(sections), list(subjects.values()), lab_rooms)
+
+
+def save_result(connection: sqlite3.Connection, genome: Genome, department: Optional[str], seed: Optional[int],
+                stop_reason: Optional[str]) -> int:
+    # The run and all of its assignments are written in a single transaction
+    with connection:
+        run_id = connection.execute(
+            "INSERT INTO runs (department, seed, fitness, stop_reason, created) VALUES (?, ?, ?, ?, ?)",
+            (department, seed, engine.calculate_fitness(genome), stop_reason,
+             time.strftime("%Y-%m-%dT%H:%M:%S"))).lastrowid
+        connection.executemany(
+            "INSERT INTO assignments (run_id, day, time, section, subject, teacher, room) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(run_id,) + tuple(gene) for gene in genome])
+    return run_id
+
+
+def load_result(connection: sqlite3.Connection, run_id: int) -> Genome:
+    return [tuple(row) for row in connection.execute(
+        "SELECT day, time, section, subject, teacher, room FROM assignments WHERE run_id = ? ORDER BY rowid",
+        (run_id,))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store for timetable datasets and results")
+    parser.add_argument("--db", default=DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="import rooms.csv, sections.csv and subjects.csv")
+    importer.add_argument("data_dir")
+    importer.add_argument("--department", help="department for sections without a Department column")
+
+    solver = commands.add_parser("solve", help="solve one department (or all) and store the result")
+    solver.add_argument("--department")
+    solver.add_argument("--seed", type=int, default=0)
+    solver.add_argument("--memetic", action="store_true", help="refine offspring with tabu local search")
+    args = parser.parse_args()
+
+    connection = connect(args.db)
+    if args.command == "import":
+        count = import_csv(connection, args.data_dir, args.department)
+        print(f"Imported {count} sections; departments: {', '.join(departments(connection))}")
+        return
+
+    start = time.perf_counter()
+    load_department(connection, args.department)
+    print(f"Loaded {len(engine.ROOMS)} sections in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    best, stop_reason = engine.run(memetic=args.memetic, seed=args.seed)
+    run_id = save_result(connection, best, args.department, args.seed, stop_reason)
+    print(f"Run {run_id}: fitness {engine.calculate_fitness(best)} ({stop_reason})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import csv
+import json
+from typing import Callable, Dict, List, NamedTuple
+
+
+# One record per generation, built from scores the GA already computed
+class GenerationStats(NamedTuple):
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    worst_fitness: float
+    diversity: float
+    evaluations: int
+    selection_time: float
+    crossover_time: float
+    mutation_time: float
+    fitness_time: float
+
+
+GenerationCallback = Callable[[GenerationStats], None]
+
+PHASES = ["selection", "crossover", "mutation", "fitness"]
+
+
+def summarize_scores(scores: List[float]) -> Dict[str, float]:
+    return {
+        "best_fitness": max(scores),
+        "mean_fitness": sum(scores) / len(scores),
+        "worst_fitness": min(scores),
+    }
+
+
+class TelemetryRecorder:
+    # Pass an instance as the on_generation callback to collect every record
+
+    def __init__(self, every: int = 1):
+        self.every = every
+        self.records: List[GenerationStats] = []
+
+    def __call__(self, stats: GenerationStats):
+        if stats.generation % self.every == 0:
+            self.records.append(stats)
+
+    def phase_totals(self) -> Dict[str, float]:
+        return {phase: sum(getattr(record, f"{phase}_time") for record in self.records) for phase in PHASES}
+
+    def to_csv(self, path: str):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(GenerationStats._fields)
+            writer.writerows(self.records)
+
+    def to_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump({
+                "generations": [record._asdict() for record in self.records],
+                "phase_totals": self.phase_totals(),
+            }, f, indent=2)
+
+
+def print_generation(stats: GenerationStats):
+    print(f"GENERATION {stats.generation:02d}: best {stats.best_fitness} "
+          f"mean {stats.mean_fitness:.1f} worst {stats.worst_fitness} "
+          f"diversity {stats.diversity:.2f} evaluations {stats.evaluations}")
+
@@ -0,0 +1,64 @@
+import os
+import shutil
+
+import pytest
+
+import engine
+from batch import GenomeCodec, batch_fitness, encode_population
+from memetic import DeltaEvaluator
+from seeding import make_rng
+
+# The fitness rules exist three times: engine.calculate_fitness, memetic.day_penalty (through
+# DeltaEvaluator) and batch.batch_fitness. They have to agree on every genome the GA can produce.
+
+PINS = """Section,Day,Time,Subject,Teacher,Room
+A,Monday,9:00-9:50,Operating System,Pratap,
+B,Friday,2:40-3:30,Software Engineering Lab,Sherin,AL2
+B,Friday,3:40-4:30,Software Engineering Lab,Sherin,AL2
+C,Tuesday,9:00-9:50,Assembly,,
+A,Friday,9:00-9:50,Assembly,,Hall
+D,Monday,1:40-2:30,Opensource Lab,,
+"""
+
+
+@pytest.fixture(params=["sample", "pinned"])
+def dataset(request, tmp_path):
+    data_dir = str(tmp_path / "Data")
+    shutil.copytree(engine.DATA_DIR, data_dir)
+    if request.param == "pinned":
+        with open(os.path.join(data_dir, "pins.csv"), "w") as f:
+            f.write(PINS)
+    engine.load_data(data_dir)
+    yield data_dir
+    engine.load_data()
+
+
+def genomes(count: int = 30, seed: int = 0):
+    # Initial genomes of both initializers, then crossed and mutated ones built from them
+    rng = make_rng(seed)
+    parents = [engine.construct_genome(rng=rng) for _ in range(3)] + \
+              [engine.generate_genome(rng=rng) for _ in range(3)]
+    result = list(parents)
+    while len(result) < count:
+        a, b = rng.sample(parents, 2)
+        child, _ = engine.crossover(a, b, rng)
+        for _ in range(rng.randint(1, 5)):
+            child = engine.mutate(child, rng)
+        result.append(child)
+    return result
+
+
+def test_fitness_implementations_agree(dataset):
+    population = genomes()
+    codec = GenomeCodec()
+    batch = batch_fitness(codec, encode_population(codec, population)).tolist()
+    for genome, batch_score in zip(population, batch):
+        expected = engine.calculate_fitness(genome)
+        assert DeltaEvaluator(genome).fitness == expected
+        assert batch_score == expected
+
+
+def test_pins_survive_operators(dataset):
+    for genome in genomes():
+        pinned = [gene for gene in genome if engine.MODEL.is_pinned(gene)]
+        assert len(pinned) == sum(len(slots) for slots in engine.MODEL.pins.values())
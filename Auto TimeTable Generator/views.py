@@ -0,0 +1,87 @@
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from export import genome_frame, timetable_frames
+
+# Parameters
+SECTIONS_PER_PAGE = 10
+SEARCH_FIELDS = {"Section": "section", "Teacher": "teacher", "Room": "room"}
+
+
+class TimetableViews:
+    # Everything the UI shows for one GA result, built once: the per-section grids from a single
+    # unstack plus teacher/room -> sections indexes for search. Resource grids are built on demand.
+
+    def __init__(self, genome: Sequence[Tuple[str, ...]], days: List[str], times: List[str]):
+        self.genome = genome
+        self.days, self.times = days, times
+        self.frame = genome_frame(genome)
+        self.frames = timetable_frames(genome, days, times)
+        self.sections = sorted(self.frames)
+
+        classes = self.frame[(self.frame["subject"] != "Free") & (self.frame["teacher"] != "N/A")]
+        self.index: Dict[str, Dict[str, List[str]]] = {
+            "section": {section: [section] for section in self.sections},
+            "teacher": {name: sorted(rows["section"].unique()) for name, rows in classes.groupby("teacher")},
+            "room": {name: sorted(rows["section"].unique())
+                     for name, rows in self.frame[self.frame["subject"] != "Free"].groupby("room")},
+        }
+        self.resource_frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+
+    def search(self, field: str, query: str) -> Tuple[List[str], List[str]]:
+        # Case-insensitive substring match; returns the matching names and the sections they cover
+        query = query.strip().lower()
+        names = [name for name in self.index[field] if query in name.lower()]
+        sections = sorted({section for name in names for section in self.index[field][name]})
+        return names, sections
+
+    def resource_frame(self, field: str, name: str) -> pd.DataFrame:
+        # Weekly grid of one teacher or room across all sections
+        if (field, name) not in self.resource_frames:
+            rows = self.frame[(self.frame[field] == name) & (self.frame["subject"] != "Free")]
+            cells = rows.assign(cell=rows["subject"] + "\n" + rows["section"])
+            grid = cells.groupby(["time", "day"])["cell"].agg("\n".join).unstack("day")
+            self.resource_frames[(field, name)] = grid.reindex(index=self.times, columns=self.days)
+        return self.resource_frames[(field, name)]
+
+
+def cached_views(genome: Sequence[Tuple[str, ...]], days: List[str], times: List[str],
+                 key: str = "timetable") -> TimetableViews:
+    # Reruns (widget changes) reuse the views as long as the same genome object is shown
+    cache = st.session_state.setdefault("timetable_views", {})
+    views = cache.get(key)
+    if views is None or views.genome is not genome:
+        views = cache[key] = TimetableViews(genome, days, times)
+    return views
+
+
+def render_timetables(genome: Sequence[Tuple[str, ...]], days: List[str], times: List[str],
+                      key: str = "timetable"):
+    # Only the current page of sections is rendered
+    views = cached_views(genome, days, times, key)
+
+    search_by = st.radio("Search by", list(SEARCH_FIELDS), horizontal=True, key=f"{key}-field")
+    query = st.text_input(f"{search_by} contains", key=f"{key}-query")
+    field = SEARCH_FIELDS[search_by]
+    names, sections = views.search(field, query) if query else (list(views.index[field]), views.sections)
+
+    if query and field != "section" and len(names) == 1:
+        st.subheader(f"{search_by} {names[0]}")
+        st.dataframe(views.resource_frame(field, names[0]))
+
+    if not sections:
+        st.write("No matching sections.")
+        return
+
+    pages = math.ceil(len(sections) / SECTIONS_PER_PAGE)
+    # A new search starts again from its first page
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                           key=f"{key}-page-{field}-{query}")
+    start = (page - 1) * SECTIONS_PER_PAGE
+    st.caption(f"Sections {start + 1}-{min(start + SECTIONS_PER_PAGE, len(sections))} of {len(sections)}")
+    for section in sections[start:start + SECTIONS_PER_PAGE]:
+        st.subheader(f"Section {section}")
+        st.dataframe(views.frames[section])
@@ -0,0 +1,293 @@
+from collections import namedtuple
+import csv
+import json
+import random
+import time
+from typing import Dict, List, NamedTuple, Optional, Callable, Sequence, Tuple
+
+Genome = List[int]
+Population = List[Genome]
+PopulateFunc = Callable[[], Population]
+FitnessFunc = Callable[[Genome], int]
+SelectionFunc = Callable[[Population, FitnessFunc], Tuple[Genome, Genome]]
+PairSelectionFunc = Callable[[Population, List[int], int], List[Tuple[Genome, Genome]]]
+CrossoverFunc = Callable[[Genome, Genome], Tuple[Genome, Genome]]
+MutationFunc = Callable[[Genome], Genome]
+PrinterFunc = Callable[[Population, int, FitnessFunc], None]
+Thing = namedtuple('Thing', ['name', 'value', 'weight'])
+
+
+# One record per generation, built from the scores run_evolution already caches
+class GenerationStats(NamedTuple):
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    worst_fitness: float
+    diversity: float
+    evaluations: int
+    selection_time: float
+    crossover_time: float
+    mutation_time: float
+    fitness_time: float
+
+
+GenerationCallback = Callable[[GenerationStats], None]
+
+PHASES = ["selection", "crossover", "mutation", "fitness"]
+
+
+def resolve_rng(rng: Optional[random.Random]) -> random.Random:
+    # Seeded runs pass their own generator; otherwise the shared random module is used
+    return rng if rng is not None else random
+
+
+def generate_genome(length: int, rng: Optional[random.Random] = None) -> Genome:
+    return resolve_rng(rng).choices([0, 1], k=length)
+
+
+def generate_population(size: int, genome_length: int, rng: Optional[random.Random] = None) -> Population:
+    return [generate_genome(genome_length, rng) for _ in range(size)]
+
+
+def fitness(genome: Genome, things: List[Thing], weight_limit: int) -> int:
+    if len(genome) != len(things):
+        raise ValueError("genome and things must be of the same length")
+
+    weight = 0
+    value = 0
+
+    for i, thing in enumerate(things):
+        if genome[i] == 1:
+            weight += thing.weight
+            value += thing.value
+
+            if weight > weight_limit:
+                return 0
+
+    return value
+
+
+def single_point_crossover(a: Genome, b: Genome, rng: Optional[random.Random] = None) -> Tuple[Genome, Genome]:
+    if len(a) != len(b):
+        raise ValueError("Genomes a and b must be of same length")
+
+    length = len(a)
+    if length < 2:
+        return a, b
+
+    p = resolve_rng(rng).randint(1, length - 1)
+    return a[0:p] + b[p:], b[0:p] + a[p:]
+
+
+def mutation(genome: Genome, num: int = 1, probability: float = 0.5,
+             rng: Optional[random.Random] = None) -> Genome:
+    rng = resolve_rng(rng)
+    for _ in range(num):
+        index = rng.randrange(len(genome))
+        genome[index] = genome[index] if rng.random() > probability else abs(genome[index] - 1)
+    return genome
+
+
+def population_fitness(population: Population, fitness_func: FitnessFunc) -> int:
+    return sum([fitness_func(genome) for genome in population])
+
+
+def selection_pair(population: Population, fitness_func: FitnessFunc,
+                   rng: Optional[random.Random] = None) -> Population:
+    return resolve_rng(rng).choices(
+        population=population,
+        weights=[fitness_func(gene) for gene in population],
+        k=2
+    )
+
+
+class AliasTable:
+    # Vose's alias method over a fixed weight vector: O(n) to build, O(1) per draw.
+    # All-zero weights (every genome overweight) fall back to uniform sampling.
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights] if total > 0 else [1.0] * n
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1.0 up to rounding error and keep probability 1
+
+    def draw(self, k: int, rng: Optional[random.Random] = None) -> List[int]:
+        rng = resolve_rng(rng)
+        n = len(self.probability)
+        draws = []
+        for _ in range(k):
+            i = rng.randrange(n)
+            draws.append(i if rng.random() < self.probability[i] else self.alias[i])
+        return draws
+
+
+def roulette_pairs(population: Population, scores: List[int], count: int,
+                   rng: Optional[random.Random] = None) -> List[Tuple[Genome, Genome]]:
+    # Fitness-proportional parents for a whole generation: one table per score vector, all draws at once
+    draws = AliasTable(scores).draw(2 * count, rng)
+    return [(population[draws[i]], population[draws[i + 1]]) for i in range(0, len(draws), 2)]
+
+
+def sort_population(population: Population, fitness_func: FitnessFunc) -> Population:
+    return sorted(population, key=fitness_func, reverse=True)
+
+
+def genome_to_string(genome: Genome) -> str:
+    return "".join(map(str, genome))
+
+
+def cached_fitness(population: Population, fitness_func: FitnessFunc) -> FitnessFunc:
+    # Score each genome once per generation; printers and selection reuse the values
+    scores = {tuple(genome): fitness_func(genome) for genome in population}
+
+    def lookup(genome: Genome) -> int:
+        key = tuple(genome)
+        if key not in scores:
+            scores[key] = fitness_func(genome)
+        return scores[key]
+
+    return lookup
+
+
+def population_diversity(population: Population) -> float:
+    # Mean pairwise Hamming distance as a fraction of the genome length, exact in O(n * length) for
+    # 0/1 genomes: a position where c of n genomes hold a 1 differs in c * (n - c) of the pairs
+    n = len(population)
+    if n < 2 or not population[0]:
+        return 0.0
+    differing = sum(ones * (n - ones) for ones in map(sum, zip(*population)))
+    return differing / (n * (n - 1) / 2) / len(population[0])
+
+
+class TelemetryRecorder:
+    # Pass an instance as run_evolution's on_generation callback to collect every record
+
+    def __init__(self, every: int = 1):
+        self.every = every
+        self.records: List[GenerationStats] = []
+
+    def __call__(self, stats: GenerationStats):
+        if stats.generation % self.every == 0:
+            self.records.append(stats)
+
+    def phase_totals(self) -> Dict[str, float]:
+        return {phase: sum(getattr(record, f"{phase}_time") for record in self.records) for phase in PHASES}
+
+    def to_csv(self, path: str):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(GenerationStats._fields)
+            writer.writerows(self.records)
+
+    def to_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump({
+                "generations": [record._asdict() for record in self.records],
+                "phase_totals": self.phase_totals(),
+            }, f, indent=2)
+
+
+def print_stats(population: Population, generation_id: int, fitness_func: FitnessFunc):
+    scores = [fitness_func(genome) for genome in population]
+    best = max(range(len(population)), key=lambda i: scores[i])
+    worst = min(range(len(population)), key=lambda i: scores[i])
+
+    print("GENERATION %02d" % generation_id)
+    print("=============")
+    print("Population: [%s]" % ", ".join([genome_to_string(gene) for gene in population]))
+    print("Avg. Fitness: %f" % (sum(scores) / len(population)))
+    print("Best: %s (%f)" % (genome_to_string(population[best]), scores[best]))
+    print("Worst: %s (%f)" % (genome_to_string(population[worst]), scores[worst]))
+    print("")
+
+    return population[best]
+
+
+def run_evolution(
+        populate_func: PopulateFunc,
+        fitness_func: FitnessFunc,
+        fitness_limit: int,
+        selection_func: Optional[SelectionFunc] = None,
+        crossover_func: CrossoverFunc = single_point_crossover,
+        mutation_func: MutationFunc = mutation,
+        generation_limit: int = 100,
+        printer: Optional[PrinterFunc] = None,
+        pair_selection_func: PairSelectionFunc = roulette_pairs,
+        on_generation: Optional[GenerationCallback] = None) \
+        -> Tuple[Population, int]:
+    # Parents come from pair_selection_func, once per generation, unless a per-pair
+    # selection_func such as selection_pair is given. on_generation gets a GenerationStats
+    # record per generation; the generation that reaches fitness_limit has no breeding times.
+    population = populate_func()
+    evaluations = 0
+
+    def counted_fitness(genome: Genome) -> int:
+        nonlocal evaluations
+        evaluations += 1
+        return fitness_func(genome)
+
+    for i in range(generation_limit):
+        t0 = time.perf_counter()
+        generation_fitness = cached_fitness(population, counted_fitness)
+        population = sorted(population, key=generation_fitness, reverse=True)
+        fitness_time = time.perf_counter() - t0
+
+        if printer is not None:
+            printer(population, i, generation_fitness)
+
+        def report(selection_time: float = 0.0, crossover_time: float = 0.0, mutation_time: float = 0.0):
+            if on_generation is None:
+                return
+            scores = [generation_fitness(genome) for genome in population]
+            on_generation(GenerationStats(
+                generation=i,
+                best_fitness=scores[0],
+                mean_fitness=sum(scores) / len(scores),
+                worst_fitness=scores[-1],
+                diversity=population_diversity(population),
+                evaluations=evaluations,
+                selection_time=selection_time,
+                crossover_time=crossover_time,
+                mutation_time=mutation_time,
+                fitness_time=fitness_time))
+
+        if generation_fitness(population[0]) >= fitness_limit:
+            report()
+            break
+
+        next_generation = population[0:2]
+        pair_count = int(len(population) / 2) - 1
+
+        t1 = time.perf_counter()
+        if selection_func is not None:
+            pairs = [selection_func(population, generation_fitness) for _ in range(pair_count)]
+        else:
+            pairs = pair_selection_func(population, [generation_fitness(genome) for genome in population], pair_count)
+        selection_time = time.perf_counter() - t1
+
+        crossover_time = mutation_time = 0.0
+        for parents in pairs:
+            t2 = time.perf_counter()
+            offspring_a, offspring_b = crossover_func(parents[0], parents[1])
+            t3 = time.perf_counter()
+            offspring_a = mutation_func(offspring_a)
+            offspring_b = mutation_func(offspring_b)
+            crossover_time += t3 - t2
+            mutation_time += time.perf_counter() - t3
+            next_generation += [offspring_a, offspring_b]
+
+        report(selection_time, crossover_time, mutation_time)
+        population = next_generation
+
+    return population, i
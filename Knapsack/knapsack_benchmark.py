@@ -0,0 +1,183 @@
+import argparse
+import json
+import math
+import random
+import time
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from knapsack import (FitnessFunc, Genome, Thing, fitness, generate_population, mutation, roulette_pairs,
+                      run_evolution, single_point_crossover)
+
+# Classic hard-instance families (Pisinger): values drawn relative to weights in [1, R]
+KINDS = ["uncorrelated", "weakly_correlated", "strongly_correlated", "subset_sum"]
+SIZES = [20, 50, 100]
+DATA_RANGE = 1000
+CAPACITY_RATIO = 0.5
+POPULATION_SIZE = 10
+GENERATION_LIMIT = 100
+TARGET_RATIO = 1.0
+
+Solver = Callable[[List[Thing], int, int, FitnessFunc, random.Random], Tuple[Genome, int]]
+
+
+def generate_things(kind: str, n: int, seed: int, data_range: int = DATA_RANGE) -> List[Thing]:
+    rng = random.Random(seed)
+    things = []
+    for i in range(n):
+        weight = rng.randint(1, data_range)
+        if kind == "uncorrelated":
+            value = rng.randint(1, data_range)
+        elif kind == "weakly_correlated":
+            spread = data_range // 10
+            value = max(1, weight + rng.randint(-spread, spread))
+        elif kind == "strongly_correlated":
+            value = weight + data_range // 10
+        elif kind == "subset_sum":
+            value = weight
+        else:
+            raise ValueError(f"unknown instance kind: {kind}")
+        things.append(Thing(f"Item {i + 1}", value, weight))
+    return things
+
+
+def capacity_for(things: List[Thing], ratio: float = CAPACITY_RATIO) -> int:
+    return int(ratio * sum(thing.weight for thing in things))
+
+
+def count_calls(func: Callable) -> Callable:
+    def counted(*args, **kwargs):
+        counted.calls += 1
+        return func(*args, **kwargs)
+
+    counted.calls = 0
+    return counted
+
+
+def dynamic_programming(things: List[Thing], weight_limit: int, target: int,
+                        fitness_func: FitnessFunc = None, rng: random.Random = None) -> Tuple[Genome, int]:
+    # Exact O(n * weight_limit) solver, also used as the reference optimum
+    best = [0] * (weight_limit + 1)
+    taken = [[False] * (weight_limit + 1) for _ in things]
+    for i, thing in enumerate(things):
+        for capacity in range(weight_limit, thing.weight - 1, -1):
+            candidate = best[capacity - thing.weight] + thing.value
+            if candidate > best[capacity]:
+                best[capacity] = candidate
+                taken[i][capacity] = True
+
+    genome = [0] * len(things)
+    capacity = weight_limit
+    for i in range(len(things) - 1, -1, -1):
+        if taken[i][capacity]:
+            genome[i] = 1
+            capacity -= things[i].weight
+    return genome, 0
+
+
+def greedy(things: List[Thing], weight_limit: int, target: int,
+           fitness_func: FitnessFunc = None, rng: random.Random = None) -> Tuple[Genome, int]:
+    genome = [0] * len(things)
+    weight = 0
+    for i in sorted(range(len(things)), key=lambda i: things[i].value / things[i].weight, reverse=True):
+        if weight + things[i].weight <= weight_limit:
+            genome[i] = 1
+            weight += things[i].weight
+    return genome, 0
+
+
+def genetic_algorithm(things: List[Thing], weight_limit: int, target: int,
+                      fitness_func: FitnessFunc, rng: random.Random) -> Tuple[Genome, int]:
+    # Every operator draws from the run's own stream
+    population, generations = run_evolution(
+        populate_func=partial(generate_population, size=POPULATION_SIZE, genome_length=len(things), rng=rng),
+        fitness_func=fitness_func,
+        fitness_limit=target,
+        pair_selection_func=partial(roulette_pairs, rng=rng),
+        crossover_func=partial(single_point_crossover, rng=rng),
+        mutation_func=partial(mutation, rng=rng),
+        generation_limit=GENERATION_LIMIT
+    )
+    return population[0], generations
+
+
+SOLVERS: Dict[str, Solver] = {
+    "run_evolution": genetic_algorithm,
+    "greedy": greedy,
+    "dynamic_programming": dynamic_programming,
+}
+
+
+def run_solver(name: str, things: List[Thing], weight_limit: int, optimum: int, seed: int,
+               target_ratio: float = TARGET_RATIO) -> Dict:
+    target = math.ceil(target_ratio * optimum)
+    counted_fitness = count_calls(partial(fitness, things=things, weight_limit=weight_limit))
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    try:
+        genome, generations = SOLVERS[name](things, weight_limit, target, counted_fitness, rng)
+        error = None
+    except ValueError as e:
+        # Solvers report unusable instances as ValueError; the run is recorded rather than aborted
+        genome, generations, error = [0] * len(things), None, str(e)
+    elapsed = time.perf_counter() - start
+
+    value = fitness(genome, things, weight_limit)
+    return {
+        "solver": name,
+        "value": value,
+        "gap": (optimum - value) / optimum if optimum else 0.0,
+        "seconds": elapsed,
+        "evaluations": counted_fitness.calls,
+        "generations": generations,
+        "time_to_target": elapsed if value >= target else None,
+        "evaluations_to_target": counted_fitness.calls if value >= target else None,
+        "error": error,
+    }
+
+
+def run_batch(kinds: List[str], sizes: List[int], seeds: List[int], solvers: List[str],
+              target_ratio: float = TARGET_RATIO) -> Dict:
+    results = []
+    for kind in kinds:
+        for n in sizes:
+            for seed in seeds:
+                things = generate_things(kind, n, seed)
+                weight_limit = capacity_for(things)
+                optimum_genome, _ = dynamic_programming(things, weight_limit, 0)
+                optimum = fitness(optimum_genome, things, weight_limit)
+                for name in solvers:
+                    result = run_solver(name, things, weight_limit, optimum, seed, target_ratio)
+                    result.update({"kind": kind, "n": n, "seed": seed,
+                                   "weight_limit": weight_limit, "optimum": optimum})
+                    results.append(result)
+                    print(f"{kind} n={n} seed={seed} {name}: gap {result['gap']:.4f} "
+                          f"in {result['seconds']:.3f}s")
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "population_size": POPULATION_SIZE,
+        "generation_limit": GENERATION_LIMIT,
+        "target_ratio": target_ratio,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark knapsack solvers on generated instances")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--target-ratio", type=float, default=TARGET_RATIO)
+    parser.add_argument("--output", default="knapsack_benchmark.json")
+    args = parser.parse_args()
+
+    report = run_batch(args.kinds, args.sizes, args.seeds, args.solvers, args.target_ratio)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()